@@ -0,0 +1,43 @@
+import importlib
+import threading
+import types
+
+_import_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Заглушка модуля: настоящий импорт происходит при первом обращении
+    к атрибуту, после чего атрибуты модуля копируются в заглушку и
+    дальнейшие обращения идут напрямую, без __getattr__.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = name
+
+    def _load(self):
+        with _import_lock:
+            module = importlib.import_module(self.__dict__["_lazy_target"])
+            self.__dict__.update(module.__dict__)
+            return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        loaded = "loaded" if "__file__" in self.__dict__ else "not loaded"
+        return f"<lazy module {self.__dict__['_lazy_target']!r} ({loaded})>"
+
+
+def lazy_import(name):
+    """
+    import name, отложенный до первого использования:
+
+        pd = lazy_import("pandas")   # pandas ещё не импортирован
+        pd.DataFrame(...)            # импорт здесь
+    """
+    return _LazyModule(name)
@@ -1,6 +1,15 @@
+import sys
+import warnings
 from collections import defaultdict
-import pandas as pd
-import numpy as np
+
+from ._lazy import lazy_import
+from .cube import StrikeCube
+from .incidence import table_incidence
+from .instrumentation import instrument_module
+from .timeseries import TimeBuckets
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 
 NORMALIZE_INDUSTRIES = {
@@ -185,7 +194,33 @@ def prepare_industries(
         reverse=True
     )
 
+def _pivot_cube_counts(counts, index, columns, index_name):
+    pivot = (
+        counts
+        .pivot(index=index, columns=columns, values="count")
+        .fillna(0)
+        .astype(np.int64)
+    )
+    pivot.index.name = index_name
+    return pivot.reset_index().sort_values(index_name)
+
+def _yearly_bucket_counts(buckets, by, index_name, where=None):
+    counts = buckets.counts("year", by=by, where=where)
+    # как у pivot_table: только годы с событиями
+    counts = counts[counts.to_numpy().any(axis=1)]
+    counts.index = pd.Index(counts.index.year, name=index_name)
+    return counts.reset_index().sort_values(index_name)
+
 def prepare_strikes_by_year_and_city(df, state="Guangdong"):
+    # куб (StrikeCube) отвечает срезом, без прохода по событиям
+    if isinstance(df, StrikeCube):
+        return _pivot_cube_counts(
+            df.count(["year", "City"], where={"State": state}),
+            "year", "City", "Year"
+        )
+    if isinstance(df, TimeBuckets):
+        return _yearly_bucket_counts(df, "City", "Year", where={"State": state})
+
     gd = df[df["State"] == state].copy()
 
     gd["Year"] = gd["Start_Date"].dt.year
@@ -197,7 +232,8 @@ def prepare_strikes_by_year_and_city(df, state="Guangdong"):
             columns="City",
             values="id",
             aggfunc="count",
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
         .reset_index()
         .sort_values("Year")
@@ -206,6 +242,14 @@ def prepare_strikes_by_year_and_city(df, state="Guangdong"):
     return pivot
 
 def prepare_strikes_by_year_and_category(df, category_col):
+    if isinstance(df, StrikeCube):
+        return _pivot_cube_counts(
+            df.count(["year", category_col]),
+            "year", category_col, "year"
+        )
+    if isinstance(df, TimeBuckets):
+        return _yearly_bucket_counts(df, category_col, "year")
+
     tmp = df.copy()
     tmp["year"] = tmp["Start_Date"].dt.year
 
@@ -217,7 +261,8 @@ def prepare_strikes_by_year_and_category(df, category_col):
             columns=category_col,
             values="id",
             aggfunc="count",
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
         .reset_index()
         .sort_values("year")
@@ -225,38 +270,84 @@ def prepare_strikes_by_year_and_category(df, category_col):
 
     return result
 
-def prepare_strikes_by_state_and_response(df):
-    action_data = defaultdict(int)
+def prepare_strike_counts(buckets, resolution="year", by=None, where=None, rolling=None):
+    """
+    Счётчики забастовок на разрешении resolution (day / week / month /
+    quarter / year) из TimeBuckets (dl.load_time_buckets): колонка period —
+    начало периода, дальше count или группы by
+    """
+    counts = buckets.counts(resolution, by=by, where=where, rolling=rolling)
+    counts.index = pd.Index(counts.index.to_timestamp(), name="period")
+    return counts.reset_index()
+
+def explode_count(
+    df,
+    field,
+    by=None,
+    weights=None,
+    sep="/",
+    fill=None,
+    skip_empty=True,
+    name="count"
+):
+    """
+    Векторный подсчёт значений многозначного поля ("Strike/Protest")
+    в разрезе ключей by: произведение матрицы групп на матрицу
+    событие × токен. weights — колонка с весами строк.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+
+    for key in by:
+        df = df[df[key].notna() & (df[key] != "")]
+
+    # таблица из общего кэша — срез готовой матрицы (dl.load_strikes_incidence)
+    incidence = table_incidence(
+        df, field, sep=sep, fill=fill, skip_empty=skip_empty
+    )
 
-    for _, row in df.iterrows():
-        state = row.get("State")
-        action_str = row.get("Action_Response")
+    if by:
+        codes = df.groupby(by, sort=False, observed=True).ngroup().to_numpy()
+        groups = df[by].drop_duplicates().reset_index(drop=True)
+    else:
+        codes = np.zeros(len(df), dtype=np.int64)
+        groups = pd.DataFrame(index=[0])
 
-        if not state or not action_str:
-            continue
+    counts = incidence.count_by(
+        codes,
+        len(groups),
+        None if weights is None else df[weights].to_numpy()
+    )
+    g, t = np.nonzero(counts)
 
-        parts = [p.strip() for p in action_str.split("/")]
+    result = groups.iloc[g].reset_index(drop=True)
+    result[field] = np.asarray(incidence.tokens, dtype=object)[t]
+    result[name] = counts[g, t].astype(np.int64)
 
-        for part in parts:
-            action_data[(state, part)] += 1
+    return result
 
-    data = [
-        (state, response, cnt)
-        for (state, response), cnt in action_data.items()
-    ]
 
-    return pd.DataFrame(
-        data,
-        columns=["State", "Response", "Number_of_Strikes"]
-    )
+def prepare_strikes_by_state_and_response(df):
+    if isinstance(df, StrikeCube):
+        return df.count_tokens("Action_Response", by="State").rename(
+            columns={"Action_Response": "Response", "count": "Number_of_Strikes"}
+        )
+
+    return explode_count(
+        df, "Action_Response", by="State", name="Number_of_Strikes"
+    ).rename(columns={"Action_Response": "Response"})
 
 def prepare_strikes_by_state_and_industry(df, min_count=5):
-    grouped = (
-        df
-        .groupby(["State", "Industry"])
-        .size()
-        .reset_index(name="Number_of_Strikes")
-    )
+    if isinstance(df, StrikeCube):
+        grouped = df.count(["State", "Industry"]).rename(
+            columns={"count": "Number_of_Strikes"}
+        )
+    else:
+        grouped = (
+            df
+            .groupby(["State", "Industry"], observed=True)
+            .size()
+            .reset_index(name="Number_of_Strikes")
+        )
 
     return grouped[grouped["Number_of_Strikes"] >= min_count]
 
@@ -264,10 +355,17 @@ def prepare_strikes_by_state_and_demand(
     df,
     min_state_strikes=20
 ):
+    if isinstance(df, StrikeCube):
+        totals = df.count("State")
+        active_states = totals.loc[totals["count"] > min_state_strikes, "State"].tolist()
+        return df.count_tokens(
+            "Worker_Demands", by="State", where={"State": active_states}
+        ).rename(columns={"Worker_Demands": "Demand", "count": "Number_of_Strikes"})
+
     # 1. отбираем активные регионы
     active_states = (
         df
-        .groupby("State")
+        .groupby("State", observed=True)
         .size()
         .reset_index(name="total")
         .query("total > @min_state_strikes")["State"]
@@ -276,80 +374,52 @@ def prepare_strikes_by_state_and_demand(
     df = df[df["State"].isin(active_states)]
 
     # 2. разбиваем Worker_Demands
-    demand_data = defaultdict(int)
-
-    for _, row in df.iterrows():
-        state = row.get("State")
-        demands = row.get("Worker_Demands")
-
-        if not state or not demands:
-            continue
-
-        parts = [p.strip() for p in demands.split("/")]
-
-        for part in parts:
-            demand_data[(state, part)] += 1
-
-    data = [
-        (state, demand, cnt)
-        for (state, demand), cnt in demand_data.items()
-    ]
-
-    return pd.DataFrame(
-        data,
-        columns=["State", "Demand", "Number_of_Strikes"]
-    )
+    return explode_count(
+        df, "Worker_Demands", by="State", name="Number_of_Strikes"
+    ).rename(columns={"Worker_Demands": "Demand"})
 
 def prepare_action_by_state_and_type(
     df,
     min_count=5
 ):
     # сначала считаем общее число инцидентов
-    grouped = (
-        df
-        .groupby(["State", "Strike_or_Protest"])
-        .size()
-        .reset_index(name="count")
-    )
+    if isinstance(df, StrikeCube):
+        grouped = df.count(["State", "Strike_or_Protest"])
+    else:
+        grouped = (
+            df
+            .groupby(["State", "Strike_or_Protest"], observed=True)
+            .size()
+            .reset_index(name="count")
+        )
 
     # HAVING COUNT(*) > 4
     grouped = grouped[grouped["count"] >= min_count]
 
-    action_data = defaultdict(int)
-
-    for _, row in grouped.iterrows():
-        state = row["State"]
-        action_str = row["Strike_or_Protest"]
-        count = row["count"]
-
-        if not action_str:
-            continue
-
-        parts = [p.strip() for p in action_str.split("/")]
-
-        for part in parts:
-            action_data[(state, part)] += count
-
-    data = [
-        (state, action, cnt)
-        for (state, action), cnt in action_data.items()
-    ]
-
-    return pd.DataFrame(
-        data,
-        columns=["State", "Action", "Number_of_Strikes"]
-    )
+    return explode_count(
+        grouped,
+        "Strike_or_Protest",
+        by="State",
+        weights="count",
+        name="Number_of_Strikes"
+    ).rename(columns={"Strike_or_Protest": "Action"})
 
 def prepare_strikes_by_size(df, state=None):
-    if state:
-        df = df[df["State"] == state]
-
-    grouped = (
-        df
-        .groupby("Range_Number_of_Employees")
-        .size()
-        .reset_index(name="Number_of_Strikes")
-    )
+    if isinstance(df, StrikeCube):
+        grouped = df.count(
+            "Range_Number_of_Employees",
+            where={"State": state} if state else None
+        ).rename(columns={"count": "Number_of_Strikes"})
+    else:
+        if state:
+            df = df[df["State"] == state]
+
+        grouped = (
+            df
+            .groupby("Range_Number_of_Employees", observed=True)
+            .size()
+            .reset_index(name="Number_of_Strikes")
+        )
 
     def sort_key(label):
         try:
@@ -359,25 +429,28 @@ def prepare_strikes_by_size(df, state=None):
 
     grouped = grouped.sort_values(
         by="Range_Number_of_Employees",
-        key=lambda s: s.map(sort_key)
+        key=lambda s: s.astype(object).map(sort_key)
     )
 
     return grouped
 
 def prepare_demands(df):
-    df = df.copy()
-
-    df["Worker_Demands"] = df["Worker_Demands"].fillna("Other")
-    df["Worker_Demands"] = df["Worker_Demands"].str.split("/")
-
-    df = df.explode("Worker_Demands")
-    df["Worker_Demands"] = df["Worker_Demands"].str.strip()
+    if isinstance(df, StrikeCube):
+        return (
+            df.count_tokens("Worker_Demands", skip_empty=False, fill="Other")
+            .rename(columns={"count": "total_strikes"})
+            .sort_values("total_strikes", ascending=False)
+        )
 
     return (
-        df.groupby("Worker_Demands")
-          .size()
-          .reset_index(name="total_strikes")
-          .sort_values("total_strikes", ascending=False)
+        explode_count(
+            df,
+            "Worker_Demands",
+            fill="Other",
+            skip_empty=False,
+            name="total_strikes"
+        )
+        .sort_values("total_strikes", ascending=False)
     )
 
 def robust_zscore(series, base_value=None):
@@ -388,6 +461,10 @@ def robust_zscore(series, base_value=None):
     return (series - median) / (1.4826 * mad)
 
 
+def _penalize(x, alpha=2):
+    return np.where(x >= 0, 1 + x, 1 / (1 + np.abs(x) * alpha))
+
+
 def build_strike_table(
     df_start,
     df_end,
@@ -485,15 +562,167 @@ def build_strike_table(
         0.0
     )
 
-    def penalize(x, alpha=2):
-        return np.where(x >= 0, 1 + x, 1 / (1 + np.abs(x) * alpha))
-
     merged["strike_leverage"] = (
-        penalize(merged["comp_avg_workers"]) *
-        penalize(merged["comp_emp_growth"]) *
-        penalize(merged["comp_profit_worker"]) *
-        penalize(merged["comp_profit_per_worker_growth"])
+        _penalize(merged["comp_avg_workers"]) *
+        _penalize(merged["comp_emp_growth"]) *
+        _penalize(merged["comp_profit_worker"]) *
+        _penalize(merged["comp_profit_per_worker_growth"])
         - 1
     )
 
-    return merged
\ No newline at end of file
+    return merged
+
+
+def strike_table_for_years(store, year_start, year_end, median_profit_base=None):
+    """
+    build_strike_table для любой пары лет из IndustryStore
+    (dl.load_industry_store()); отрасли сопоставляются по единому имени
+    """
+    # пару 2013 → 2023 build_strike_table сопоставляет сам — по исходным именам
+    source_names = (year_start, year_end) == (2013, 2023)
+    return build_strike_table(
+        store.frame(year_start, source_names),
+        store.frame(year_end, source_names),
+        year_start,
+        year_end,
+        median_profit_base
+    )
+
+
+# --- пакетный расчёт: все пары лет (и регионы) одним проходом ---
+INDUSTRY_COLUMNS = [
+    "Enterprises",
+    "Output Value",
+    "Business Revenue",
+    "Total Profits",
+    "Employed Persons",
+]
+
+
+def year_pairs(years, spans=(5, 10)):
+    """Скользящие окна: все пары (год, год + span), которые есть в years"""
+    years = sorted(set(years))
+    known = set(years)
+    return [
+        (year, year + span)
+        for span in spans
+        for year in years
+        if year + span in known
+    ]
+
+
+def _robust_zscore_rows(values, base):
+    # robust_zscore по последней оси; NaN (нет отрасли) не участвуют
+    deviation = values - base
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mad = np.nanmedian(np.abs(deviation), axis=-1, keepdims=True)
+    ok = (mad != 0) & ~np.isnan(mad)
+    return np.where(ok, deviation / (1.4826 * np.where(ok, mad, 1)), 0.0)
+
+
+def build_strike_tables(panel, pairs, by=None, median_profit_base=None):
+    """
+    build_strike_table для многих пар лет (и групп, например провинций —
+    колонка by) за один проход. panel — длинная таблица year × Sector
+    (dl.load_industry_panel(); одна строка на год, отрасль и группу).
+    Отрасли сопоставляются по Sector, поэтому имена должны быть едиными.
+    Возвращает длинную таблицу: year_start, year_end, [by], Sector и
+    колонки build_strike_table, в порядке пар, затем отраслей.
+    """
+    pairs = [(int(start), int(end)) for start, end in pairs]
+
+    year_codes, year_labels = pd.factorize(panel["year"])
+    sector_codes, sector_labels = pd.factorize(panel["Sector"])
+    if by is None:
+        group_codes, group_labels = np.zeros(len(panel), dtype=np.int64), [None]
+    else:
+        group_codes, group_labels = pd.factorize(panel[by])
+
+    year_index = {int(year): i for i, year in enumerate(year_labels)}
+    for year in {y for pair in pairs for y in pair}:
+        if year not in year_index:
+            raise ValueError(f"no industry data for {year}")
+
+    # плотный массив группа × год × отрасль × показатель; NaN — строки нет
+    n_groups, n_years, n_sectors = len(group_labels), len(year_labels), len(sector_labels)
+    values = np.full((n_groups, n_years, n_sectors, len(INDUSTRY_COLUMNS)), np.nan)
+    present = np.zeros((n_groups, n_years, n_sectors), dtype=bool)
+    values[group_codes, year_codes, sector_codes] = panel[INDUSTRY_COLUMNS].to_numpy(dtype=float)
+    present[group_codes, year_codes, sector_codes] = True
+
+    starts = np.array([year_index[start] for start, _ in pairs], dtype=np.int64)
+    ends = np.array([year_index[end] for _, end in pairs], dtype=np.int64)
+
+    # (группа × пара) × отрасль: одна строка на будущую таблицу
+    start_values = values[:, starts].reshape(-1, n_sectors, len(INDUSTRY_COLUMNS))
+    end_values = values[:, ends].reshape(-1, n_sectors, len(INDUSTRY_COLUMNS))
+    keep = (present[:, starts] & present[:, ends]).reshape(-1, n_sectors)
+    start_values = np.where(keep[..., None], start_values, np.nan)
+    end_values = np.where(keep[..., None], end_values, np.nan)
+
+    col = {name: i for i, name in enumerate(INDUSTRY_COLUMNS)}
+    profits = end_values[..., col["Total Profits"]]
+    workers = end_values[..., col["Employed Persons"]]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = {
+            "profit_per_worker": profits / workers,
+            "profit_per_worker_start": (
+                start_values[..., col["Total Profits"]] /
+                start_values[..., col["Employed Persons"]]
+            ),
+        }
+        out["Profit per Worker growth (%)"] = (
+            np.arcsinh(out["profit_per_worker"]) -
+            np.arcsinh(out["profit_per_worker_start"])
+        ) * 100
+        growth = (end_values / start_values - 1) * 100
+        for name, i in col.items():
+            out[f"{name}_pct_growth"] = growth[..., i]
+
+        out["Weight"] = profits / np.nansum(profits, axis=1, keepdims=True) * 100
+        out["avg_workers_per_enterprise"] = workers * 10000 / end_values[..., col["Enterprises"]]
+
+    # --- композитные компоненты ---
+    year_end = np.tile(np.array([end for _, end in pairs]), n_groups)[:, None]
+    base_emp_growth = np.where(year_end == 2013, 64.61, 7.48)
+    base_avg_workers = 400
+
+    if median_profit_base is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median_profit_base = np.nanmedian(out["profit_per_worker"], axis=1, keepdims=True)
+
+    out["comp_avg_workers"] = 0.20 * _robust_zscore_rows(out["avg_workers_per_enterprise"], base_avg_workers)
+    out["comp_emp_growth"] = 0.20 * np.minimum(
+        _robust_zscore_rows(out["Employed Persons_pct_growth"], base_emp_growth), 0
+    )
+    out["comp_profit_worker"] = 0.40 * _robust_zscore_rows(out["profit_per_worker"], median_profit_base)
+    out["comp_profit_per_worker_growth"] = 0.20 * _robust_zscore_rows(out["Profit per Worker growth (%)"], 0.0)
+
+    out["strike_leverage"] = (
+        _penalize(out["comp_avg_workers"]) *
+        _penalize(out["comp_emp_growth"]) *
+        _penalize(out["comp_profit_worker"]) *
+        _penalize(out["comp_profit_per_worker_growth"])
+        - 1
+    )
+
+    # --- длинная таблица: только отрасли, которые есть в обоих годах ---
+    table_ids, sector_ids = np.nonzero(keep)
+    pair_ids = table_ids % len(pairs)
+    result = {
+        "year_start": np.array([start for start, _ in pairs])[pair_ids],
+        "year_end": np.array([end for _, end in pairs])[pair_ids],
+    }
+    if by is not None:
+        result[by] = np.asarray(group_labels, dtype=object)[table_ids // len(pairs)]
+    result["Sector"] = np.asarray(sector_labels, dtype=object)[sector_ids]
+    for name, column in out.items():
+        result[name] = column[table_ids, sector_ids]
+
+    return pd.DataFrame(result)
+
+
+instrument_module(sys.modules[__name__])
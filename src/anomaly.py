@@ -0,0 +1,332 @@
+"""
+Аномальные всплески месячных счётчиков забастовок (провинция × отрасль и т.п.):
+
+    from src import anomaly
+
+    counts = anomaly.monthly_strike_counts(dl.load_strikes_df(path))
+    scores = anomaly.rolling_anomaly_scores(counts)        # вся история сразу
+
+    detector = anomaly.StrikeAnomalyDetector(window=12)
+    detector.backfill(counts)
+    detector.update(new_month_counts)                      # новый месяц
+
+Оценка — robust_zscore нового значения относительно предыдущих window
+месяцев ряда: (x − медиана) / (1.4826 · MAD). В потоке медиана и MAD
+окна поддерживаются инкрементально (RollingMedianMAD), без пересчёта
+по всему окну.
+"""
+
+import math
+import random
+import warnings
+from collections import deque
+
+from ._lazy import lazy_import
+from .timeseries import TimeBuckets
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+MAD_SCALE = 1.4826
+
+
+# --- упорядоченное окно: skiplist с шириной ссылок ---
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, next, width):
+        self.value = value
+        self.next = next
+        self.width = width
+
+
+_NIL = _Node(math.inf, [], [])
+
+
+class IndexableSkiplist:
+    """
+    Отсортированный мультисписок: вставка, удаление, элемент по номеру
+    и ранг значения — O(log n) в среднем
+    """
+
+    def __init__(self, expected_size=100, seed=0):
+        self.size = 0
+        self.maxlevels = int(1 + math.log2(max(expected_size, 2)))
+        self.head = _Node(None, [_NIL] * self.maxlevels, [1] * self.maxlevels)
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        node = self.head
+        i += 1
+        for level in reversed(range(self.maxlevels)):
+            while node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def __iter__(self):
+        node = self.head.next[0]
+        while node is not _NIL:
+            yield node.value
+            node = node.next[0]
+
+    def rank(self, value):
+        """Число элементов меньше value"""
+        node = self.head
+        rank = 0
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value < value:
+                rank += node.width[level]
+                node = node.next[level]
+        return rank
+
+    def insert(self, value):
+        chain = [None] * self.maxlevels
+        steps_at_level = [0] * self.maxlevels
+        node = self.head
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = min(self.maxlevels, 1 - int(math.log2(1.0 - self._random.random())))
+        new = _Node(value, [None] * height, [None] * height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, self.maxlevels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        chain = [None] * self.maxlevels
+        node = self.head
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is _NIL or target.value != value:
+            raise KeyError(value)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.maxlevels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+
+class RollingMedianMAD:
+    """
+    Медиана и MAD последних window значений ряда. Обновление — O(log w),
+    медиана — O(log w), MAD — O(log² w): k-я порядковая статистика
+    отклонений ищется двоичным поиском по двум отсортированным половинам
+    окна (ниже и выше медианы), без прохода по окну.
+    """
+
+    def __init__(self, window=12):
+        self.window = window
+        self.values = deque()
+        self.sorted = IndexableSkiplist(window)
+
+    def __len__(self):
+        # значений в окне без пропусков
+        return len(self.sorted)
+
+    def push(self, value):
+        # NaN занимает место в окне, но в статистики не входит
+        self.values.append(value)
+        if value == value:
+            self.sorted.insert(value)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.sorted.remove(old)
+
+    def median(self):
+        n = len(self.sorted)
+        if n == 0:
+            return math.nan
+        return (self.sorted[(n - 1) // 2] + self.sorted[n // 2]) / 2
+
+    def _kth_deviation(self, k, m, below):
+        # отклонения ниже медианы: m − s[below−1−i] (по возрастанию),
+        # выше: s[below+j] − m (по возрастанию); k — номер (с нуля) в объединении
+        s = self.sorted
+        n_low, n_high = below, len(s) - below
+
+        def low(i):
+            return m - s[below - 1 - i]
+
+        def high(j):
+            return s[below + j] - m
+
+        lo, hi = max(0, k + 1 - n_high), min(k + 1, n_low)
+        while lo < hi:
+            i = (lo + hi) // 2
+            if low(i) < high(k - i):
+                lo = i + 1
+            else:
+                hi = i
+        j = k + 1 - lo
+        return max(
+            low(lo - 1) if lo > 0 else -math.inf,
+            high(j - 1) if j > 0 else -math.inf
+        )
+
+    def mad(self, median=None):
+        n = len(self.sorted)
+        if n == 0:
+            return math.nan
+        m = self.median() if median is None else median
+        below = self.sorted.rank(m)
+        return (
+            self._kth_deviation((n - 1) // 2, m, below) +
+            self._kth_deviation(n // 2, m, below)
+        ) / 2
+
+    def score(self, value, min_periods=1, min_mad=None, median=None, mad=None):
+        """
+        robust_zscore value относительно окна (value в окно не добавляется);
+        MAD = 0 → 0, как в analysis.robust_zscore; min_mad — нижняя граница MAD.
+        median / mad — уже посчитанные для текущего окна значения
+        """
+        if len(self) < min_periods or value != value:
+            return math.nan
+        m = self.median() if median is None else median
+        mad = self.mad(m) if mad is None else mad
+        if min_mad is not None:
+            mad = max(mad, min_mad)
+        if mad == 0:
+            return 0.0
+        return (value - m) / (MAD_SCALE * mad)
+
+
+# --- ряды из таблицы событий ---
+def monthly_strike_counts(df, by=("State", "Industry"), date_col="Start_Date"):
+    """
+    Месячные счётчики событий (load_strikes_df или TimeBuckets из
+    dl.load_time_buckets): строки — месяцы без пропусков, колонки —
+    сочетания by, пустые месяцы — 0
+    """
+    by = list(by)
+    if isinstance(df, TimeBuckets):
+        return df.counts("month", by=by).sort_index(axis=1)
+
+    df = df[df[date_col].notna()]
+    month = df[date_col].dt.to_period("M").rename("month")
+
+    counts = df.groupby([month] + [df[col] for col in by], observed=True).size()
+    wide = counts.unstack(by, fill_value=0)
+
+    months = pd.period_range(wide.index.min(), wide.index.max(), freq="M", name="month")
+    return wide.reindex(months, fill_value=0).sort_index(axis=1)
+
+
+def rolling_anomaly_scores(counts, window=12, min_periods=6, min_mad=None):
+    """
+    Оценки для всей истории сразу (то же, что RollingMedianMAD.score по
+    каждому месяцу): медиана и MAD предыдущих window месяцев — массивом
+    месяцы × ряды × окно
+    """
+    values = counts.to_numpy(dtype=float)
+    n_months, n_series = values.shape
+
+    padded = np.vstack([np.full((window, n_series), np.nan), values])
+    # окно месяца t — строки t−window … t−1 исходной таблицы
+    windows = np.lib.stride_tricks.sliding_window_view(padded[:-1], window, axis=0)
+
+    periods = (~np.isnan(windows)).sum(axis=2)
+    median = np.median(windows, axis=2)
+    mad = np.median(np.abs(windows - median[..., None]), axis=2)
+
+    # неполные окна (начало ряда, пропуски) — через nanmedian, только они
+    partial = periods < window
+    if partial.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            short = windows[partial]
+            median[partial] = np.nanmedian(short, axis=1)
+            mad[partial] = np.nanmedian(np.abs(short - median[partial][:, None]), axis=1)
+
+    if min_mad is not None:
+        mad = np.maximum(mad, min_mad)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(mad == 0, 0.0, (values - median) / (MAD_SCALE * mad))
+    scores[(periods < min_periods) | np.isnan(values)] = np.nan
+
+    return pd.DataFrame(scores, index=counts.index, columns=counts.columns)
+
+
+class StrikeAnomalyDetector:
+    """
+    Поток месячных счётчиков по многим рядам: update() принимает новый
+    месяц и сразу отдаёт оценки; окно каждого ряда — RollingMedianMAD
+    """
+
+    def __init__(self, window=12, min_periods=6, threshold=3.5, min_mad=None):
+        self.window = window
+        self.min_periods = min_periods
+        self.threshold = threshold
+        self.min_mad = min_mad
+        self.series = {}
+        self.last_month = None
+
+    def update(self, counts, month=None):
+        """
+        counts — Series {ряд: счётчик} за новый месяц; известные ряды,
+        которых нет в counts, получают 0. Возвращает DataFrame по рядам:
+        count, median, mad, score, anomaly (score > threshold)
+        """
+        values = counts.to_dict()
+        keys = list(values)
+        keys += [key for key in self.series if key not in values]
+
+        rows = []
+        for key in keys:
+            value = float(values.get(key, 0))
+            window = self.series.get(key)
+            if window is None:
+                window = self.series[key] = RollingMedianMAD(self.window)
+
+            median = window.median()
+            mad = window.mad(median)
+            score = window.score(value, self.min_periods, self.min_mad, median, mad)
+            rows.append((value, median, mad, score))
+            window.push(value)
+
+        self.last_month = month
+        if isinstance(counts.index, pd.MultiIndex):
+            index = pd.MultiIndex.from_tuples(keys, names=counts.index.names)
+        else:
+            index = pd.Index(keys, name=counts.index.name)
+        result = pd.DataFrame(rows, index=index, columns=["count", "median", "mad", "score"])
+        result["anomaly"] = result["score"] > self.threshold
+        return result
+
+    def backfill(self, counts):
+        """
+        Прогоняет историю (таблица monthly_strike_counts) месяц за месяцем;
+        возвращает аномалии: month, ряд, count, score
+        """
+        found = []
+        for month, row in counts.iterrows():
+            result = self.update(row, month)
+            hits = result[result["anomaly"]]
+            for key, hit in hits.iterrows():
+                found.append((month, key, hit["count"], hit["score"]))
+        return pd.DataFrame(found, columns=["month", "series", "count", "score"])
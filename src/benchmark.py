@@ -0,0 +1,611 @@
+"""
+Бенчмарки загрузки, анализа и построения графиков на синтетических данных:
+
+    python -m src.benchmark --sizes 10k 100k 1M --out benchmark_results.json
+    python -m src.benchmark --sizes 10k 100k --baseline benchmark_baseline.json
+
+Генератор пишет события в схеме chinese_strikes.json (10k … 10M строк),
+для каждой публичной функции загрузки, анализа и графиков записываются
+время (лучшее и медиана из --repeat запусков), пиковая память (tracemalloc)
+и число строк результата. С --baseline печатается сравнение с сохранённым
+прогоном. Группа import — время импорта модулей пакета в свежем
+процессе (так стартуют рабочие процессы конвейера).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from . import analysis as an
+from . import anomaly
+from . import data_loading as dl
+from . import plots
+from . import sensitivity as sens
+from .timeseries import build_time_buckets
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# --- распределения синтетических событий ---
+# провинция: (вес, города); внутри провинции города идут по убыванию частоты
+STATES = {
+    "Guangdong": (0.34, ["Shenzhen", "Dongguan", "Guangzhou", "Foshan", "Huizhou", "Zhongshan", "Jiangmen"]),
+    "Zhejiang": (0.07, ["Hangzhou", "Ningbo", "Wenzhou", "Jinhua"]),
+    "Jiangsu": (0.07, ["Suzhou", "Nanjing", "Wuxi", "Changzhou"]),
+    "Henan": (0.06, ["Zhengzhou", "Luoyang", "Nanyang"]),
+    "Shandong": (0.06, ["Qingdao", "Jinan", "Yantai"]),
+    "Sichuan": (0.05, ["Chengdu", "Mianyang"]),
+    "Hebei": (0.04, ["Shijiazhuang", "Baoding", "Tangshan"]),
+    "Fujian": (0.04, ["Xiamen", "Fuzhou", "Quanzhou"]),
+    "Hunan": (0.04, ["Changsha", "Zhuzhou"]),
+    "Hubei": (0.04, ["Wuhan", "Yichang"]),
+    "Shaanxi": (0.03, ["Xi'an", "Xianyang"]),
+    "Shanghai": (0.03, ["Shanghai"]),
+    "Beijing": (0.02, ["Beijing"]),
+    "Liaoning": (0.03, ["Shenyang", "Dalian"]),
+    "Anhui": (0.03, ["Hefei", "Wuhu"]),
+    "Guangxi": (0.02, ["Nanning", "Liuzhou"]),
+    "Yunnan": (0.02, ["Kunming"]),
+    "Heilongjiang": (0.01, ["Harbin", "Daqing"]),
+}
+
+# отрасль: (вес, подотрасли); None — подотрасль не указана
+INDUSTRIES = {
+    "Manufacturing": (0.36, ["Electronics", "Garments", "Footwear", "Auto parts", "Furniture", "Toys", "Machinery"]),
+    "Construction": (0.30, ["Housing", "Infrastructure", "Decoration", None]),
+    "Services": (0.12, ["Retail", "Restaurants", "Security", "Property management"]),
+    "Transportation": (0.10, ["Taxi", "Logistics", "Bus"]),
+    "Education": (0.05, ["Teachers", "Kindergartens"]),
+    "Mining": (0.04, ["Coal", "Metal ores"]),
+    "Other": (0.03, [None]),
+}
+
+SIZES = {
+    "1-100": 0.30,
+    "101-1000": 0.32,
+    "1001-10000": 0.14,
+    "10000+": 0.04,
+    None: 0.20,
+}
+
+# токены многозначных полей: (вес токена, распределение числа токенов 1..k,
+# доля "", доля NaN)
+ACTIONS = (
+    {"Strike": 0.55, "Protest": 0.25, "Demonstration": 0.08, "Sit-in": 0.06,
+     "Blocking road": 0.04, "Petition": 0.02},
+    [0.85, 0.13, 0.02], 0.0, 0.0,
+)
+DEMANDS = (
+    {"Wage arrears": 0.55, "Compensation": 0.12, "Social insurance": 0.09, "Pay": 0.08,
+     "Relocation": 0.05, "Layoffs": 0.05, "Work conditions": 0.04, "Overtime": 0.02},
+    [0.75, 0.2, 0.05], 0.10, 0.05,
+)
+RESPONSES = (
+    {"Police": 0.45, "Negotiation": 0.25, "Government intervention": 0.2, "Arrests": 0.1},
+    [0.8, 0.2], 0.45, 0.05,
+)
+
+# годовая интенсивность (относительная): рост к 2015–2016, затем спад
+YEAR_WEIGHTS = {
+    2011: 0.35, 2012: 0.5, 2013: 0.6, 2014: 0.9, 2015: 1.0, 2016: 0.95, 2017: 0.6,
+    2018: 0.65, 2019: 0.6, 2020: 0.35, 2021: 0.4, 2022: 0.35, 2023: 0.55, 2024: 0.5,
+}
+
+GENERATOR_CHUNK = 500_000
+
+
+def _normalized(weights):
+    p = np.asarray(weights, dtype=float)
+    return p / p.sum()
+
+
+def _token_combos(spec, rng, n_combos=200):
+    # набор комбинаций "A/B/C" с убывающими (zipf) весами
+    tokens, k_weights, empty, missing = spec
+    names = list(tokens)
+    p = _normalized(list(tokens.values()))
+
+    combos = []
+    for _ in range(n_combos):
+        k = rng.choice(np.arange(1, len(k_weights) + 1), p=_normalized(k_weights))
+        combos.append("/".join(rng.choice(names, size=k, replace=False, p=p)))
+    combos, counts = np.unique(combos, return_counts=True)
+
+    values = list(combos) + ["", None]
+    weights = np.append(_normalized(counts) * (1 - empty - missing), [empty, missing])
+    return values, weights
+
+
+def _day_weights():
+    days = pd.date_range("2011-01-01", "2024-12-31", freq="D")
+    w = days.year.map(YEAR_WEIGHTS).to_numpy(dtype=float)
+    # перед Новым годом по лунному календарю — волна задолженностей по зарплате
+    w = w * np.where(days.month.isin([1, 12]), 1.8, 1.0)
+    # выходные — реже
+    w = w * np.where(days.dayofweek >= 5, 0.6, 1.0)
+    return days.strftime("%Y-%m-%d").to_numpy(), _normalized(w)
+
+
+def _choose(rng, values, weights, n):
+    idx = rng.choice(len(values), size=n, p=_normalized(weights))
+    return np.asarray(values, dtype=object)[idx]
+
+
+def synthetic_strikes(n_rows, seed=0, start_id=1):
+    """
+    DataFrame событий в схеме chinese_strikes.json (даты — строки ISO)
+    """
+    rng = np.random.default_rng(seed)
+
+    states = list(STATES)
+    state = _choose(rng, states, [STATES[s][0] for s in states], n_rows)
+    city = np.empty(n_rows, dtype=object)
+    for s in states:
+        rows = np.flatnonzero(state == s)
+        cities = STATES[s][1]
+        city[rows] = _choose(rng, cities, 1 / np.arange(1, len(cities) + 1), len(rows))
+
+    industries = list(INDUSTRIES)
+    industry = _choose(rng, industries, [INDUSTRIES[i][0] for i in industries], n_rows)
+    sub = np.empty(n_rows, dtype=object)
+    for i in industries:
+        rows = np.flatnonzero(industry == i)
+        subs = INDUSTRIES[i][1]
+        sub[rows] = _choose(rng, subs, 1 / np.arange(1, len(subs) + 1), len(rows))
+
+    days, day_p = _day_weights()
+    dates = days[rng.choice(len(days), size=n_rows, p=day_p)].astype(object)
+    # немного битых дат — в загрузчике они становятся NaT
+    dates[rng.random(n_rows) < 0.001] = ""
+
+    columns = {
+        "id": np.arange(start_id, start_id + n_rows),
+        "Start_Date": dates,
+        "State": state,
+        "City": city,
+        "Industry": industry,
+        "subIndustry_name": sub,
+        "Range_Number_of_Employees": _choose(rng, list(SIZES), list(SIZES.values()), n_rows),
+    }
+    for k, (field, spec) in enumerate((
+        ("Strike_or_Protest", ACTIONS),
+        ("Worker_Demands", DEMANDS),
+        ("Action_Response", RESPONSES),
+    )):
+        # набор комбинаций один на все куски файла
+        values, weights = _token_combos(spec, np.random.default_rng(k))
+        columns[field] = _choose(rng, values, weights, n_rows)
+
+    return pd.DataFrame(columns)
+
+
+def write_synthetic_strikes(path, n_rows, seed=0, chunk_size=GENERATOR_CHUNK):
+    """
+    Пишет {"chinese_strikes": [...]} кусками — 10M строк не держатся в памяти целиком
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write('{"chinese_strikes": [')
+        for k, start in enumerate(range(0, n_rows, chunk_size)):
+            chunk = synthetic_strikes(
+                min(chunk_size, n_rows - start), seed=[seed, k], start_id=start + 1
+            )
+            records = chunk.to_json(orient="records", force_ascii=False)
+            if start:
+                f.write(",")
+            f.write(records[1:-1])
+        f.write("]}")
+
+    os.replace(tmp, path)
+    return path
+
+
+def _parse_size(text):
+    text = str(text).strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * factor)
+
+
+def _size_label(n):
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def dataset(n_rows, data_dir, seed=0):
+    """Путь к синтетическому файлу (генерируется один раз на размер и seed)"""
+    path = Path(data_dir) / f"chinese_strikes_{_size_label(n_rows)}_{seed}.json"
+    if not path.exists():
+        write_synthetic_strikes(path, n_rows, seed)
+    return path
+
+
+# --- контекст: входные данные для случаев, считаются один раз на размер ---
+class _Context:
+    def __init__(self, path):
+        self.path = str(path)
+        self._values = {}
+
+    def get(self, name):
+        if name not in self._values:
+            self._values[name] = _INPUTS[name](self)
+        return self._values[name]
+
+
+_INPUTS = {
+    "events": lambda c: dl.load_strikes_df(c.path),
+    "economic": lambda c: dl.load_economic_data(),
+    "gdp": lambda c: dl.load_gdp_composition(),
+    "wages": lambda c: dl.load_wages(),
+    "industry": lambda c: {y: dl.load_industry_data(y) for y in (2003, 2013, 2023)},
+    "industry_rows": lambda c: dl.load_strikes_by_industries(c.path),
+    "strikes_by_year": lambda c: dl.load_strikes_from_json(c.path),
+    "action_types": lambda c: dl.load_action_types_from_json(c.path),
+    "economic_indicators": lambda c: an.prepare_economic_indicators(c.get("economic")),
+    "gdp_composition": lambda c: an.prepare_gdp_composition(c.get("gdp").copy()),
+    "industries": lambda c: an.prepare_industries(c.get("industry_rows")),
+    "by_city": lambda c: an.prepare_strikes_by_year_and_city(c.get("events")).rename(columns={"Year": "year"}),
+    "by_industry": lambda c: an.prepare_strikes_by_year_and_category(c.get("events"), "Industry"),
+    "by_subindustry": lambda c: an.prepare_strikes_by_year_and_category(c.get("events"), "subIndustry_name"),
+    "by_response": lambda c: an.prepare_strikes_by_state_and_response(c.get("events")),
+    "by_state_industry": lambda c: an.prepare_strikes_by_state_and_industry(c.get("events")),
+    "by_demand": lambda c: an.prepare_strikes_by_state_and_demand(c.get("events")),
+    "by_action": lambda c: an.prepare_action_by_state_and_type(c.get("events")),
+    "by_size": lambda c: an.prepare_strikes_by_size(c.get("events")),
+    "by_size_gd": lambda c: an.prepare_strikes_by_size(c.get("events"), "Guangdong"),
+    "demands": lambda c: an.prepare_demands(c.get("events")),
+    "leverage": lambda c: an.build_strike_table(c.get("industry")[2013], c.get("industry")[2023], 2013, 2023),
+    "time_buckets": lambda c: dl.load_time_buckets(c.path),
+    "monthly_counts": lambda c: anomaly.monthly_strike_counts(c.get("events"), by=("City", "subIndustry_name")),
+}
+
+
+def _detector_month(c):
+    # детектор с историей без последнего месяца; замер — один новый месяц
+    counts = c.get("monthly_counts")
+    detector = anomaly.StrikeAnomalyDetector()
+    for _, row in counts.iloc[:-1].iterrows():
+        detector.update(row)
+    return lambda: detector.update(counts.iloc[-1])
+
+
+# --- случаи: {имя: (группа, функция(контекст) -> вызов без аргументов)} ---
+# всё, что до возврата вызова, — подготовка и в замер не входит
+def _cold_json(c):
+    dl.clear_strikes_cache()
+    sidecar = dl.sidecar_path(c.path)
+    if sidecar.exists():
+        sidecar.unlink()
+
+    def run():
+        flag, dl.STRIKES_SIDECAR = dl.STRIKES_SIDECAR, False
+        try:
+            return dl.load_strikes_table(c.path)
+        finally:
+            dl.STRIKES_SIDECAR = flag
+    return run
+
+
+def _cold_sidecar(c):
+    sidecar = dl.sidecar_path(c.path)
+    if not dl._sidecar_is_fresh(Path(c.path), sidecar):
+        try:
+            dl.build_strikes_sidecar(c.path)
+        except ImportError:
+            return None
+    dl.clear_strikes_cache()
+    return lambda: dl.load_strikes_table(c.path)
+
+
+def _warm(func, *args, **kwargs):
+    def case(c):
+        dl.load_strikes_table(c.path)
+        return lambda: func(c.path, *args, **kwargs)
+    return case
+
+
+def _on(func, *inputs, **kwargs):
+    def case(c):
+        args = [c.get(name) for name in inputs]
+        return lambda: func(*args, **kwargs)
+    return case
+
+
+def _plot(func, *inputs, **kwargs):
+    # фигура строится и сериализуется (как при отдаче в браузер или рендерер)
+    def case(c):
+        args = [c.get(name) if isinstance(name, str) and name in _INPUTS else name for name in inputs]
+        plots.set_output("return")
+        plots.set_cache(None)
+        return lambda: func(*args, **kwargs).to_json()
+    return case
+
+
+CASES = {
+    # загрузка
+    "data_loading.load_strikes_table[json]": ("load", _cold_json),
+    "data_loading.load_strikes_table[sidecar]": ("load", _cold_sidecar),
+    "data_loading.load_strikes_table[cached]": ("load", _warm(dl.load_strikes_table)),
+    "data_loading.load_strikes_df": ("load", _warm(dl.load_strikes_df)),
+    "data_loading.load_strikes_df[compact]": ("load", _warm(dl.load_strikes_df, compact=True)),
+    "data_loading.load_strikes_df[stream]": ("load", lambda c: lambda: dl.load_strikes_df(c.path, stream=True)),
+    "data_loading.load_strikes_from_json": ("load", _warm(dl.load_strikes_from_json)),
+    "data_loading.load_action_types_from_json": ("load", _warm(dl.load_action_types_from_json)),
+    "data_loading.load_strikes_by_industries": ("load", _warm(dl.load_strikes_by_industries)),
+    "data_loading.load_strike_cube": ("load", _warm(dl.load_strike_cube)),
+    "data_loading.load_time_buckets": ("load", lambda c: lambda: dl.load_time_buckets(c.path).counts("month", by="State")),
+    "data_loading.load_economic_data": ("load", lambda c: dl.load_economic_data),
+    "data_loading.load_gdp_composition": ("load", lambda c: dl.load_gdp_composition),
+    "data_loading.load_wages": ("load", lambda c: dl.load_wages),
+    "data_loading.load_industry_data": ("load", lambda c: lambda: [dl.load_industry_data(y) for y in (2003, 2013, 2023)]),
+    "data_loading.load_industry_panel": ("load", lambda c: dl.load_industry_panel),
+
+    # анализ
+    "analysis.prepare_economic_indicators": ("analysis", _on(an.prepare_economic_indicators, "economic")),
+    "analysis.prepare_gdp_composition": ("analysis", lambda c: lambda: an.prepare_gdp_composition(c.get("gdp").copy())),
+    "analysis.prepare_industries": ("analysis", _on(an.prepare_industries, "industry_rows")),
+    "analysis.prepare_strikes_by_year_and_city": ("analysis", _on(an.prepare_strikes_by_year_and_city, "events")),
+    "analysis.prepare_strikes_by_year_and_category": ("analysis", _on(an.prepare_strikes_by_year_and_category, "events", category_col="subIndustry_name")),
+    "analysis.prepare_strike_counts[month]": ("analysis", _on(an.prepare_strike_counts, "time_buckets", resolution="month", by="Industry")),
+    "analysis.prepare_strike_counts[uncached]": ("analysis", lambda c: lambda: build_time_buckets(c.get("events")).counts("week", by=["State", "Industry"])),
+    "analysis.explode_count": ("analysis", _on(an.explode_count, "events", field="Worker_Demands", by=["State"])),
+    "analysis.prepare_strikes_by_state_and_response": ("analysis", _on(an.prepare_strikes_by_state_and_response, "events")),
+    "analysis.prepare_strikes_by_state_and_industry": ("analysis", _on(an.prepare_strikes_by_state_and_industry, "events")),
+    "analysis.prepare_strikes_by_state_and_demand": ("analysis", _on(an.prepare_strikes_by_state_and_demand, "events")),
+    "analysis.prepare_action_by_state_and_type": ("analysis", _on(an.prepare_action_by_state_and_type, "events")),
+    "analysis.prepare_strikes_by_size": ("analysis", _on(an.prepare_strikes_by_size, "events")),
+    "analysis.prepare_demands": ("analysis", _on(an.prepare_demands, "events")),
+    "analysis.build_strike_table": ("analysis", lambda c: lambda: an.build_strike_table(c.get("industry")[2013], c.get("industry")[2023], 2013, 2023)),
+    "analysis.strike_table_for_years": ("analysis", lambda c: lambda: an.strike_table_for_years(dl.load_industry_store(), 2008, 2018)),
+    "analysis.build_strike_tables": ("analysis", lambda c: lambda: an.build_strike_tables(dl.load_industry_panel(), an.year_pairs(dl.load_industry_store().years))),
+    "sensitivity.sensitivity_analysis": ("analysis", lambda c: lambda: sens.sensitivity_analysis(c.get("leverage"), 2023, n=10_000)),
+    "sensitivity.bootstrap_strike_leverage": ("analysis", lambda c: lambda: sens.bootstrap_strike_leverage(c.get("leverage"), 2013, 2023, n_boot=10_000)),
+    "anomaly.monthly_strike_counts": ("analysis", _on(anomaly.monthly_strike_counts, "events", by=("City", "subIndustry_name"))),
+    "anomaly.rolling_anomaly_scores": ("analysis", _on(anomaly.rolling_anomaly_scores, "monthly_counts")),
+    "anomaly.StrikeAnomalyDetector.update": ("analysis", _detector_month),
+
+    # графики (построение + JSON)
+    "plots.plot_strikes_over_time": ("plot", _plot(plots.plot_strikes_over_time, "strikes_by_year")),
+    "plots.plot_action_types_pie": ("plot", _plot(plots.plot_action_types_pie, "action_types")),
+    "plots.plot_indicator": ("plot", _plot(plots.plot_indicator, "economic_indicators", "Profit_per_worker", "Profit per worker", "Yuan", [])),
+    "plots.plot_indicators": ("plot", _plot(plots.plot_indicators, "economic_indicators", ["Profit_per_worker", "Workers_real", "TotalOutput"], [])),
+    "plots.plot_gdp": ("plot", _plot(plots.plot_gdp, "gdp_composition")),
+    "plots.plot_sunburst": ("plot", _plot(plots.plot_sunburst, "industries", "Strikes by industry")),
+    "plots.plot_wages": ("plot", _plot(plots.plot_wages, "wages")),
+    "plots.plot_strikes_by_city": ("plot", _plot(plots.plot_strikes_by_city, "by_city")),
+    "plots.plot_strikes_by_industry": ("plot", _plot(plots.plot_strikes_by_industry, "by_industry")),
+    "plots.plot_strikes_by_subindustry": ("plot", _plot(plots.plot_strikes_by_subindustry, "by_subindustry")),
+    "plots.plot_strikes_by_response_and_state": ("plot", _plot(plots.plot_strikes_by_response_and_state, "by_response")),
+    "plots.plot_strikes_by_state_and_industry": ("plot", _plot(plots.plot_strikes_by_state_and_industry, "by_state_industry")),
+    "plots.plot_strikes_by_state_and_demand": ("plot", _plot(plots.plot_strikes_by_state_and_demand, "by_demand")),
+    "plots.plot_action_by_state_and_type": ("plot", _plot(plots.plot_action_by_state_and_type, "by_action")),
+    "plots.plot_strikes_by_size": ("plot", _plot(plots.plot_strikes_by_size, "by_size", "by_size_gd", "Strikes by enterprise size")),
+    "plots.plot_demands": ("plot", _plot(plots.plot_demands, "demands")),
+    "plots.plot_industry_vulnerability": ("plot", _plot(plots.plot_industry_vulnerability, "leverage", "Structural labor power")),
+}
+
+
+# --- время импорта: отдельный процесс на каждый замер ---
+IMPORT_MODULES = ("data_loading", "analysis", "plots", "pipeline")
+HEAVY_MODULES = ("numpy", "pandas", "plotly")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def import_time(module, repeat=5):
+    """
+    Импорт module в свежем интерпретаторе: лучшее и медианное время,
+    какие из тяжёлых библиотек (HEAVY_MODULES) он подтянул
+    """
+    script = _IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    root = Path(__file__).resolve().parent.parent
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=root, capture_output=True, text=True, check=True
+        )
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(run["seconds"])
+        loaded = run["loaded"]
+
+    return {
+        "seconds": min(times),
+        "median": statistics.median(times),
+        "peak_bytes": None,
+        "rows_out": None,
+        "loaded": loaded,
+    }
+
+
+def _selected(name, group, only):
+    return not only or any(name.startswith(p) or group == p for p in only)
+
+
+def _rows(result):
+    if isinstance(result, (pd.DataFrame, pd.Series, list)):
+        return len(result)
+    return None
+
+
+def measure(case, context, repeat=3, memory=True):
+    """
+    Замер одного случая: лучшее и медианное время из repeat запусков,
+    пик памяти (tracemalloc, отдельным запуском), строки результата
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        run = case(context)
+        if run is None:
+            return None
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - started)
+
+    peak = None
+    if memory:
+        run = case(context)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "median": statistics.median(times),
+        "peak_bytes": peak,
+        "rows_out": _rows(result),
+    }
+
+
+def run_benchmarks(sizes, data_dir=None, repeat=3, only=None, memory=True, seed=0, log=print):
+    """
+    Прогоняет все случаи (или только с префиксами only) на каждом размере.
+    Возвращает {"meta": ..., "results": [...]}.
+    """
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / "chinese_strikes_bench")
+    names = [name for name in CASES if _selected(name, CASES[name][0], only)]
+
+    results = []
+    modules = [
+        f"{__package__}.{m}" for m in IMPORT_MODULES
+        if _selected(f"import.{m}", "import", only)
+    ]
+    if modules:
+        log("--- import (fresh process) ---")
+    for module in modules:
+        stats = import_time(module, repeat=max(repeat, 3))
+        results.append({"size": 0, "group": "import", "name": f"import.{module}", **stats})
+        log(f"{'import ' + module:55s} {stats['seconds'] * 1e3:10.2f} ms  {', '.join(stats['loaded']) or '-'}")
+
+    for n_rows in sizes if names else ():
+        path = dataset(n_rows, data_dir, seed)
+        dl.clear_strikes_cache()
+        context = _Context(path)
+        log(f"--- {_size_label(n_rows)} rows ({path}) ---")
+
+        for name in names:
+            group, case = CASES[name]
+            stats = measure(case, context, repeat, memory)
+            if stats is None:
+                log(f"{name:55s} skipped")
+                continue
+            results.append({"size": n_rows, "group": group, "name": name, **stats})
+            peak = "" if stats["peak_bytes"] is None else f"{stats['peak_bytes'] / 2 ** 20:9.1f} MB"
+            log(f"{name:55s} {stats['seconds'] * 1e3:10.2f} ms {peak}")
+
+    return {"meta": _meta(seed, repeat), "results": results}
+
+
+def _meta(seed, repeat):
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Сравнение с сохранённым прогоном по (размер, случай).
+    Возвращает DataFrame; status — slower / faster / same / new.
+    """
+    base = {(r["size"], r["name"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["size"], r["name"]))
+        ratio = None if b is None or not b["seconds"] else r["seconds"] / b["seconds"]
+        if ratio is None:
+            status = "new"
+        elif ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "same"
+        rows.append({
+            "size": _size_label(r["size"]) if r["size"] else "-",
+            "name": r["name"],
+            "baseline_ms": None if b is None else b["seconds"] * 1e3,
+            "current_ms": r["seconds"] * 1e3,
+            "ratio": ratio,
+            "baseline_peak_mb": None if b is None or b.get("peak_bytes") is None else b["peak_bytes"] / 2 ** 20,
+            "current_peak_mb": None if r.get("peak_bytes") is None else r["peak_bytes"] / 2 ** 20,
+            "status": status,
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loaders, analyses and plots")
+    parser.add_argument("--sizes", nargs="*", default=["10k", "100k"], help="row counts: 10k 100k 1M 10M")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="case name prefixes or groups: import load analysis plot")
+    parser.add_argument("--data-dir", default=None, help="where synthetic datasets are kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported as slower/faster")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        [_parse_size(s) for s in args.sizes],
+        data_dir=args.data_dir,
+        repeat=args.repeat,
+        only=args.only,
+        memory=not args.no_memory,
+        seed=args.seed
+    )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"results: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report = compare(results, baseline, args.threshold)
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(report.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+        if args.fail_on_regression and (report["status"] == "slower").any():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
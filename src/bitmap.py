@@ -0,0 +1,161 @@
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+re = lazy_import("re")
+
+# колонки, по которым строятся битовые индексы таблицы событий
+BITMAP_COLUMNS = ["State", "Industry", "subIndustry_name", "Strike_or_Protest"]
+
+
+class BitmapIndex:
+    """
+    Битовые индексы таблицы событий: на каждое значение колонки —
+    упакованная битовая маска строк (np.packbits, 1 бит на событие).
+    Фильтры собираются побитовыми AND/OR, в строки маска
+    разворачивается один раз в конце.
+    """
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.bitmaps = {}
+        self.values = {}
+        # колонка → матрица масок (значение × байт) с запасом по обеим осям
+        # и {значение: строка матрицы}: дописанные строки ложатся в запас
+        self._packed = {}
+        self._codes = {}
+
+    @property
+    def nbytes(self):
+        return sum(packed.nbytes for packed in self._packed.values())
+
+    def all_rows(self):
+        bits = np.packbits(np.ones(self.n_rows, dtype=bool))
+        return bits
+
+    def no_rows(self):
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def add(self, column, values, start=0):
+        """
+        Биты строк start … start + len(values) − 1 колонки column
+        (start > 0 — дописанные строки; n_rows уже учитывает их)
+        """
+        codes, uniques = pd.factorize(values)
+
+        # номера значений пачки → строки матрицы колонки (новые — в конец)
+        known = self._codes.setdefault(column, {})
+        values_list = self.values.setdefault(column, [])
+        rows = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques):
+            row = known.get(value)
+            if row is None:
+                row = known[value] = len(values_list)
+                values_list.append(value)
+            rows[i] = row
+
+        n_bytes = (self.n_rows + 7) // 8
+        packed = self._reserve(column, len(values_list), n_bytes)
+        width = packed.shape[1]
+        flat = packed.reshape(-1)
+
+        # байт b любой маски — строки 8b … 8b+7; k-й бит байта b ставится
+        # в маске значения строки 8b + k. Все маски колонки заполняются
+        # восемью проходами по номерам бита, без отдельной маски n_rows
+        # на значение; за один проход в ячейку (значение, байт) пишет
+        # не больше одной строки
+        lead = start & 7
+        first = start >> 3
+        n_chunk = (lead + len(codes) + 7) // 8
+        padded = np.full(n_chunk * 8, -1, dtype=np.int64)
+        if not np.array_equal(rows, np.arange(len(rows))):
+            codes = np.where(codes >= 0, rows[codes], -1)
+        padded[lead:lead + len(codes)] = codes
+        padded = padded.reshape(n_chunk, 8)
+        byte = np.arange(first, first + n_chunk)
+
+        for k in range(8):
+            row = padded[:, k]
+            valid = row >= 0
+            flat[row[valid] * width + byte[valid]] |= np.uint8(0x80 >> k)
+
+        for value, row in known.items():
+            self.bitmaps[(column, value)] = packed[row, :n_bytes]
+
+    def _reserve(self, column, n_values, n_bytes):
+        # запас растёт в полтора раза — дописывание пачек амортизированно
+        # стоит пропорционально пачке, а не всей таблице
+        packed = self._packed.get(column)
+        if packed is not None and packed.shape[0] >= n_values and packed.shape[1] >= n_bytes:
+            return packed
+
+        if packed is None:
+            shape = (n_values, n_bytes)
+        else:
+            shape = (
+                max(n_values, packed.shape[0] + packed.shape[0] // 2),
+                max(n_bytes, packed.shape[1] + packed.shape[1] // 2),
+            )
+        grown = np.zeros(shape, dtype=np.uint8)
+        if packed is not None:
+            grown[:packed.shape[0], :packed.shape[1]] = packed
+        self._packed[column] = grown
+        return grown
+
+    def extend(self, df):
+        """Дописывает строки df (в конец таблицы) во все индексы"""
+        start = self.n_rows
+        self.n_rows += len(df)
+        columns = _index_columns(df, [c for c in self._packed if c != "year"])
+        for column in self._packed:
+            if column in columns:
+                self.add(column, columns[column], start)
+            else:
+                self.add(column, pd.Series([None] * len(df), dtype=object), start)
+
+    def get(self, column, value):
+        bits = self.bitmaps.get((column, value))
+        return self.no_rows() if bits is None else bits
+
+    def any_of(self, column, values):
+        bits = self.no_rows()
+        for value in values:
+            if (column, value) in self.bitmaps:
+                bits = bits | self.bitmaps[(column, value)]
+        return bits
+
+    def matching(self, column, pattern):
+        # как Series.str.contains: регулярка по каждому уникальному значению
+        regex = re.compile(pattern)
+        return self.any_of(column, [
+            v for v in self.values.get(column, [])
+            if isinstance(v, str) and regex.search(v)
+        ])
+
+    def positions(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+
+def _index_columns(df, columns):
+    out = {}
+    if "Start_Date" in df.columns:
+        years = df["Start_Date"].dt.year
+        out["year"] = years.astype("Int64") if years.hasnans else years
+    for col in columns:
+        if col in df.columns:
+            out[col] = df[col]
+    return out
+
+
+def build_bitmap_index(df, columns=None):
+    """
+    Индексы по годам Start_Date ("year") и колонкам columns;
+    новые строки дописываются BitmapIndex.extend
+    """
+    columns = BITMAP_COLUMNS if columns is None else columns
+    index = BitmapIndex(len(df))
+
+    for column, values in _index_columns(df, columns).items():
+        index.add(column, values)
+
+    return index
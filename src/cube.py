@@ -0,0 +1,251 @@
+from ._lazy import lazy_import
+from .incidence import token_incidence
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# измерения куба: год и категориальные колонки события
+CUBE_DIMENSIONS = [
+    "year",
+    "State",
+    "City",
+    "Industry",
+    "subIndustry_name",
+    "Range_Number_of_Employees",
+    "Strike_or_Protest",
+]
+
+# многозначные поля: для них строятся кубы с дополнительным измерением-токеном
+CUBE_TOKEN_FIELDS = [
+    "Strike_or_Protest",
+    "Worker_Demands",
+    "Action_Response",
+]
+
+
+def _dimension_codes(df, dim):
+    if dim == "year":
+        values = df["Start_Date"].dt.year
+    else:
+        values = df[dim]
+    codes, labels = pd.factorize(values)
+    if dim == "year":
+        # NaT отбрасывается factorize, остальные годы — целые
+        return codes, np.asarray(labels).astype(np.int64)
+    return codes, np.asarray(labels, dtype=object)
+
+
+class StrikeCube:
+    """
+    Разреженный куб счётчиков событий (год × State × City × Industry ×
+    subIndustry × размер × Strike_or_Protest) плюс кубы по токенам
+    многозначных полей. Срезы считаются суммированием ячеек, без прохода
+    по событиям. Код -1 в измерении — пропуск (NaN).
+    """
+
+    def __init__(self, dims, labels, coords, counts, tokens):
+        self.dims = dims
+        self.labels = labels
+        self.coords = coords
+        self.counts = counts
+        self.tokens = tokens
+
+    @property
+    def n_events(self):
+        return int(self.counts.sum())
+
+    def _cell_mask(self, coords, where):
+        mask = np.ones(len(coords), dtype=bool)
+        for dim, value in (where or {}).items():
+            axis = self.dims.index(dim)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            wanted = [i for i, label in enumerate(self.labels[dim]) if label in values]
+            mask &= np.isin(coords[:, axis], wanted)
+        return mask
+
+    def _group(self, coords, counts, by, extra=None):
+        # extra: (имя, коды, подписи) — дополнительное измерение (токен)
+        columns = [coords[:, self.dims.index(dim)] for dim in by]
+        sizes = [len(self.labels[dim]) for dim in by]
+        names = list(by)
+        labels = [self.labels[dim] for dim in by]
+
+        if extra is not None:
+            names.append(extra[0])
+            columns.append(extra[1])
+            sizes.append(len(extra[2]))
+            labels.append(extra[2])
+
+        keep = np.ones(len(counts), dtype=bool)
+        for col in columns:
+            keep &= col >= 0
+        columns = [col[keep] for col in columns]
+        weights = counts[keep]
+
+        # только непустые ячейки: ключ уплотняется после каждого измерения,
+        # поэтому не зависит от произведения размеров и не переполняется;
+        # порядок номеров — лексикографический по (by..., extra)
+        cell = np.zeros(len(weights), dtype=np.int64)
+        first = np.zeros(min(len(weights), 1), dtype=np.int64)
+        for col, size in zip(columns, sizes):
+            _, first, cell = np.unique(cell * size + col, return_index=True, return_inverse=True)
+            cell = cell.reshape(-1)
+
+        summed = np.bincount(cell, weights=weights, minlength=len(first))
+        nonzero = summed != 0
+
+        result = {
+            name: lab[col[first[nonzero]]]
+            for name, col, lab in zip(names, columns, labels)
+        }
+
+        out = pd.DataFrame({name: result[name] for name in names})
+        out["count"] = summed[nonzero].astype(np.int64)
+        return out
+
+    def count(self, by=(), where=None):
+        """
+        Число событий в разрезе измерений by с фильтром where
+        ({измерение: значение или список значений})
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        mask = self._cell_mask(self.coords, where)
+        return self._group(self.coords[mask], self.counts[mask], by)
+
+    def count_tokens(self, field, by=(), where=None, skip_empty=True, fill=None):
+        """
+        Число вхождений токенов многозначного поля field в разрезе by.
+        skip_empty — пропускать пустые строки и NaN (как iterrows-версии),
+        иначе NaN получает метку fill, а "" считается отдельным токеном.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cells, token_ids, counts, vocabulary = self.tokens[field]
+
+        coords = self.coords[cells]
+        mask = self._cell_mask(coords, where)
+
+        # NaN (-1) получает последнюю метку — fill
+        labels = np.asarray(list(vocabulary.tokens) + [fill], dtype=object)
+        token_ids = np.where(token_ids < 0, len(labels) - 1, token_ids)
+        if skip_empty:
+            mask &= (token_ids < len(labels) - 1) & (labels[token_ids] != "")
+
+        out = self._group(
+            coords[mask],
+            counts[mask],
+            by,
+            extra=(field, token_ids[mask], labels)
+        )
+        if not skip_empty and fill is not None:
+            # метка fill может совпасть с настоящим токеном
+            out = out.groupby(by + [field], sort=False)["count"].sum().reset_index()
+        return out
+
+    def _encode(self, df, dim):
+        # коды по уже известным меткам; новые метки дописываются в конец
+        values = df["Start_Date"].dt.year if dim == "year" else df[dim]
+        labels = self.labels[dim]
+
+        codes = pd.Index(labels).get_indexer(values)
+        unseen = pd.unique(values[(codes < 0) & values.notna().to_numpy()])
+        if len(unseen):
+            if dim == "year":
+                unseen = np.asarray(unseen).astype(np.int64)
+            labels = np.concatenate([labels, np.asarray(unseen, dtype=labels.dtype)])
+            self.labels[dim] = labels
+            codes = pd.Index(labels).get_indexer(values)
+
+        return codes.astype(np.int64)
+
+    def append(self, df):
+        """
+        Добавляет события df в куб. Стоимость пропорциональна размеру пачки:
+        ячейки пачки дописываются в конец, совпадения суммируются при запросе.
+        """
+        if len(df) == 0:
+            return self
+
+        codes = np.column_stack([self._encode(df, dim) for dim in self.dims])
+        cells, event_cell, counts = np.unique(
+            codes, axis=0, return_inverse=True, return_counts=True
+        )
+
+        offset = len(self.coords)
+        self.coords = np.concatenate([self.coords, cells])
+        self.counts = np.concatenate([self.counts, counts.astype(np.int64)])
+
+        for field, (t_cells, t_ids, t_counts, vocabulary) in self.tokens.items():
+            n_cells, n_ids, n_counts, _ = _token_cells(
+                df[field], field, event_cell.ravel() + offset, vocabulary
+            )
+            self.tokens[field] = (
+                np.concatenate([t_cells, n_cells]),
+                np.concatenate([t_ids, n_ids]),
+                np.concatenate([t_counts, n_counts]),
+                vocabulary,
+            )
+
+        return self
+
+
+def build_strike_cube(df, dims=None, token_fields=None):
+    """
+    Один проход по событиям: коды измерений → ячейки куба → счётчики
+    """
+    dims = list(CUBE_DIMENSIONS if dims is None else dims)
+    token_fields = [
+        f for f in (CUBE_TOKEN_FIELDS if token_fields is None else token_fields)
+        if f in df.columns
+    ]
+
+    codes = []
+    labels = {}
+    for dim in dims:
+        c, labels[dim] = _dimension_codes(df, dim)
+        codes.append(c)
+
+    # смешанная система счисления: код -1 сдвигаем в 0
+    key = np.zeros(len(df), dtype=np.int64)
+    for c, dim in zip(codes, dims):
+        key = key * (len(labels[dim]) + 1) + (c + 1)
+
+    cell_keys, event_cell, counts = np.unique(
+        key, return_inverse=True, return_counts=True
+    )
+
+    coords = np.empty((len(cell_keys), len(dims)), dtype=np.int64)
+    rest = cell_keys
+    for axis in reversed(range(len(dims))):
+        size = len(labels[dims[axis]]) + 1
+        coords[:, axis] = rest % size - 1
+        rest = rest // size
+
+    tokens = {}
+    for field in token_fields:
+        tokens[field] = _token_cells(df[field], field, event_cell.ravel())
+
+    return StrikeCube(dims, labels, coords, counts.astype(np.int64), tokens)
+
+
+def _token_cells(values, field, event_cell, vocabulary=None):
+    # номера токенов пачки — в словаре куба (append), а не в текущем общем
+    incidence = token_incidence(values, field, skip_empty=False, vocabulary=vocabulary)
+
+    # NaN — псевдотокен с номером -1 (в ключе сдвигаем всё на единицу)
+    missing = np.flatnonzero(values.isna().to_numpy())
+    rows = np.concatenate([incidence.row_ids(), missing])
+    token_ids = np.concatenate([
+        incidence.indices.astype(np.int64),
+        np.full(len(missing), -1, dtype=np.int64),
+    ])
+
+    n_tokens = incidence.shape[1] + 1
+    key = event_cell[rows] * n_tokens + (token_ids + 1)
+    keys, counts = np.unique(key, return_counts=True)
+
+    return (
+        keys // n_tokens,
+        keys % n_tokens - 1,
+        counts.astype(np.int64),
+        incidence.vocabulary,
+    )
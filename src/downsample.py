@@ -0,0 +1,123 @@
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+def _as_numeric(x):
+    # даты → наносекунды, числа → float; для прочего (категории) — None
+    x = pd.Series(x)
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(x):
+        return x.to_numpy(dtype=float)
+    try:
+        return pd.to_datetime(x).astype("int64").to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+# корзины до стольких точек LTTB считает одним тензором, крупнее — циклом
+LTTB_TENSOR_BUCKET = 8
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: номера n_out точек ряда (x по возрастанию),
+    сохраняющих его форму — пики и провалы остаются на месте.
+    Первая и последняя точки сохраняются всегда.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # NaN (разрывы линии) не должны выигрывать выбор точки
+    y = np.nan_to_num(y, nan=np.nanmean(y) if np.isfinite(y).any() else 0.0)
+
+    # корзина i — точки [edges[i], edges[i + 1]); последняя «следующая» — точка n - 1
+    m = n_out - 2
+    every = (n - 2) / m
+    edges = np.floor(np.arange(m + 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # средняя точка следующей корзины — через накопленные суммы
+    next_start = edges[1:]
+    next_end = np.append(edges[2:], n)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    size = next_end - next_start
+    avg_x = (cx[next_end] - cx[next_start]) / size
+    avg_y = (cy[next_end] - cy[next_start]) / size
+
+    k = int((edges[1:] - edges[:-1]).max())
+    if k <= LTTB_TENSOR_BUCKET:
+        selected = _lttb_tensor(x, y, edges, avg_x, avg_y, k)
+    else:
+        selected = _lttb_loop(x, y, edges, avg_x, avg_y)
+
+    return np.concatenate([[0], selected, [n - 1]])
+
+
+def _lttb_loop(x, y, edges, avg_x, avg_y):
+    # крупные корзины: цикл по корзинам, внутри корзины — numpy
+    selected = np.empty(len(edges) - 1, dtype=np.int64)
+    a = 0
+    for i in range(len(selected)):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i] = a
+    return selected
+
+
+def _lttb_tensor(x, y, edges, avg_x, avg_y, k):
+    # мелкие корзины: лучший кандидат корзины i считается сразу для каждой
+    # возможной опорной точки из корзины i - 1; в цикле остаётся только
+    # переход по готовой таблице
+    m = len(edges) - 1
+    pos = edges[:-1, None] + np.arange(k)[None, :]
+    valid = pos < edges[1:, None]
+    pos = np.where(valid, pos, edges[1:, None] - 1)
+    px, py = x[pos], y[pos]
+
+    # опоры: для корзины 0 — первая точка ряда, дальше — кандидаты корзины i - 1
+    ax = np.vstack([np.full((1, k), x[0]), px[:-1]])
+    ay = np.vstack([np.full((1, k), y[0]), py[:-1]])
+
+    area = np.abs(
+        (ax[:, :, None] - avg_x[:, None, None]) * (py[:, None, :] - ay[:, :, None])
+        - (ax[:, :, None] - px[:, None, :]) * (avg_y[:, None, None] - ay[:, :, None])
+    )
+    area[~np.broadcast_to(valid[:, None, :], area.shape)] = -1.0
+    best = area.argmax(axis=2)
+
+    chosen = np.empty(m, dtype=np.int64)
+    j = 0
+    for i in range(m):
+        j = best[i, j]
+        chosen[i] = j
+    return pos[np.arange(m), chosen]
+
+
+def decimate_positions(x, y, n_out):
+    """
+    Номера точек, которые остаются после LTTB, в исходной нумерации.
+    x может быть неотсортирован; нечисловой x (категории) не прореживается.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+
+    x_num = _as_numeric(x)
+    if x_num is None:
+        return np.arange(n)
+
+    order = np.argsort(x_num, kind="stable")
+    y_num = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype=float)
+    keep = lttb(x_num[order], y_num[order], n_out)
+    return order[keep]
@@ -0,0 +1,331 @@
+import os
+import queue
+import shutil
+import threading
+from pathlib import Path
+
+from ._lazy import lazy_import
+from .figure_cache import render_key
+from .instrumentation import trace
+
+futures = lazy_import("concurrent.futures")
+multiprocessing = lazy_import("multiprocessing")
+
+# форматы, которые рисует Kaleido; html и json пишет сам plotly
+IMAGE_FORMATS = {"png", "jpg", "jpeg", "webp", "svg", "pdf"}
+
+
+def _default_workers():
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _context():
+    # рабочие процессы не форкаются из процесса с потоками: копия могла бы
+    # унаследовать чужую захваченную блокировку (например, импорта) и зависнуть
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _init_renderer():
+    # рендерер (Chromium) запускается один раз на рабочий процесс
+    try:
+        import kaleido
+    except ImportError:
+        return
+    start = getattr(kaleido, "start_sync_server", None)
+    if start is not None:
+        try:
+            start(silence_warnings=True)
+        except TypeError:
+            start()
+
+
+def _write(fig_json, targets, width, height, scale):
+    import plotly.io as pio
+
+    fig = pio.from_json(fig_json)
+    for fmt, target in targets:
+        if fmt == "html":
+            fig.write_html(target, include_plotlyjs="cdn")
+        elif fmt == "json":
+            Path(target).write_text(fig_json, encoding="utf-8")
+        else:
+            pio.write_image(
+                fig, target, format=fmt,
+                width=width, height=height, scale=scale
+            )
+
+
+def _serve(conn):
+    # цикл рабочего процесса: задания по одному из канала, None — выход
+    _init_renderer()
+    conn.send(None)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        try:
+            _write(*task)
+            conn.send((True, [target for _, target in task[1]]))
+        except BaseException as exc:
+            try:
+                conn.send((False, exc))
+            except Exception:
+                conn.send((False, RuntimeError(repr(exc))))
+
+
+def _remove_partial(targets):
+    for _, target in targets:
+        try:
+            os.unlink(target)
+        except OSError:
+            pass
+
+
+class _RenderWorker:
+    """
+    Рабочий процесс рендеринга. Зависший рендер нельзя прервать изнутри,
+    поэтому по таймауту процесс убивается, а на его место поднимается новый
+    """
+
+    def __init__(self, target=_serve):
+        context = _context()
+        self._conn, child = context.Pipe()
+        self.process = context.Process(target=target, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self._ready = False
+
+    def render(self, fig_json, targets, width, height, scale, timeout):
+        if not self._ready:
+            # запуск рендерера в таймаут фигуры не входит, но и он ограничен
+            if not self._conn.poll(timeout):
+                raise TimeoutError(f"renderer did not start in {timeout}s")
+            self._conn.recv()
+            self._ready = True
+
+        self._conn.send((fig_json, targets, width, height, scale))
+        if not self._conn.poll(timeout):
+            raise TimeoutError(f"rendering took longer than {timeout}s")
+
+        # (True, файлы) или (False, исключение из _write)
+        return self._conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self._conn.close()
+
+    def stop(self):
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self._conn.close()
+
+
+class FigureExporter:
+    """
+    Постоянный пул процессов рендеринга: каждый рабочий процесс один раз
+    поднимает Kaleido и рисует все присланные ему фигуры. Фигуры рисуются
+    параллельно (workers), на каждую — не дольше timeout секунд: зависший
+    процесс убивается и заменяется новым, недописанные файлы удаляются.
+    С cache (FigureCache) картинки, уже отрисованные из того же JSON
+    с теми же параметрами, копируются из кэша без рендеринга.
+
+        with FigureExporter("figures", formats=("png", "svg")) as exporter:
+            plots.set_output("export", exporter)
+            plots.plot_wages(df)
+    """
+
+    # цикл рабочего процесса (функция уровня модуля — её импортирует
+    # порождённый процесс)
+    _worker_target = staticmethod(_serve)
+
+    def __init__(
+        self,
+        out_dir,
+        formats=("png",),
+        workers=None,
+        timeout=60,
+        width=None,
+        height=None,
+        scale=1,
+        cache=None
+    ):
+        unknown = set(formats) - IMAGE_FORMATS - {"html", "json"}
+        if unknown:
+            raise ValueError(f"unsupported formats: {sorted(unknown)}")
+
+        self.out_dir = Path(out_dir)
+        self.formats = tuple(formats)
+        self.timeout = timeout
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.cache = cache
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._tasks = queue.Queue()
+        # процессы запускаются здесь, в вызывающем потоке, до первой фигуры
+        self._threads = [
+            threading.Thread(
+                target=self._run_worker,
+                args=(_RenderWorker(self._worker_target),),
+                daemon=True
+            )
+            for _ in range(workers or _default_workers())
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._futures = {}
+        self._names = set()
+        self._lock = threading.Lock()
+
+    def _run_worker(self, worker):
+        # поток-диспетчер одного рабочего процесса
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, fig_json, targets = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                ok, result = worker.render(
+                    fig_json, targets,
+                    self.width, self.height, self.scale, self.timeout
+                )
+            except (TimeoutError, EOFError, OSError) as exc:
+                # завис или упал — убиваем (рендер не допишет файлы после
+                # ошибки), недописанное удаляем, процесс заменяем
+                worker.kill()
+                _remove_partial(targets)
+                worker = _RenderWorker(self._worker_target)
+                if not isinstance(exc, TimeoutError):
+                    exc = RuntimeError(f"renderer process died: {exc!r}")
+                future.set_exception(exc)
+                continue
+
+            if ok:
+                future.set_result(result)
+            else:
+                _remove_partial(targets)
+                future.set_exception(result)
+        worker.stop()
+
+    def _unique_name(self, name):
+        with self._lock:
+            candidate, n = name, 1
+            while candidate in self._names:
+                n += 1
+                candidate = f"{name}_{n}"
+            self._names.add(candidate)
+            return candidate
+
+    def submit(self, fig, name):
+        """
+        Ставит фигуру (go.Figure или её JSON) в очередь рендеринга;
+        возвращает Future со списком файлов
+        """
+        if isinstance(fig, str):
+            fig_json = fig
+        else:
+            with trace("plotly.to_json"):
+                fig_json = fig.to_json()
+        name = self._unique_name(name)
+        targets = [
+            (fmt, str(self.out_dir / f"{name}.{fmt}"))
+            for fmt in self.formats
+        ]
+        (self.out_dir / name).parent.mkdir(parents=True, exist_ok=True)
+
+        keys = {}
+        if self.cache is not None:
+            keys = {
+                fmt: render_key(fig_json, fmt, self.width, self.height, self.scale)
+                for fmt in self.formats if fmt in IMAGE_FORMATS
+            }
+            targets = self._from_cache(targets, keys)
+
+        if not targets:
+            future = futures.Future()
+            future.set_result([str(self.out_dir / f"{name}.{fmt}") for fmt in self.formats])
+        else:
+            future = futures.Future()
+            self._tasks.put((future, fig_json, targets))
+            if keys:
+                future.add_done_callback(
+                    lambda f, targets=targets: self._to_cache(f, targets, keys)
+                )
+            if len(targets) < len(self.formats):
+                future = self._with_cached(future, name)
+
+        self._futures[future] = name
+        return future
+
+    def _from_cache(self, targets, keys):
+        # картинки из кэша копируются сразу, рисуются только недостающие
+        missing = []
+        for fmt, target in targets:
+            cached = self.cache.get_image(keys[fmt], fmt) if fmt in keys else None
+            if cached is None:
+                missing.append((fmt, target))
+            else:
+                shutil.copyfile(cached, target)
+        return missing
+
+    def _to_cache(self, future, targets, keys):
+        if future.cancelled() or future.exception() is not None:
+            return
+        for fmt, target in targets:
+            if fmt in keys:
+                self.cache.put_image(keys[fmt], fmt, target)
+
+    def _with_cached(self, future, name):
+        # общий результат: все форматы, и из кэша, и отрисованные
+        result = futures.Future()
+
+        def done(f):
+            if f.exception() is not None:
+                result.set_exception(f.exception())
+            else:
+                result.set_result([str(self.out_dir / f"{name}.{fmt}") for fmt in self.formats])
+
+        future.add_done_callback(done)
+        return result
+
+    def join(self):
+        """
+        Ждёт все отправленные фигуры. Возвращает ({имя: [файлы]}, {имя: ошибка})
+        """
+        written, failed = {}, {}
+        pending, self._futures = self._futures, {}
+
+        futures.wait(pending)
+        for future, name in pending.items():
+            try:
+                written[name] = future.result()
+            except Exception as exc:
+                failed[name] = exc
+
+        return written, failed
+
+    def close(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _, failed = self.join()
+        self.close()
+        if failed and exc_type is None:
+            raise RuntimeError(
+                "figure export failed: "
+                + "; ".join(f"{name}: {err!r}" for name, err in failed.items())
+            )
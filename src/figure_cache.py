@@ -0,0 +1,262 @@
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+from ._lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+json = lazy_import("json")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+uuid = lazy_import("uuid")
+
+# размер кэша по умолчанию; старые записи вытесняются по времени последнего чтения
+FIGURE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+FIGURE_FILE = "figure.json"
+
+_source_hashes = {}
+
+
+def _module_hash(module_name):
+    # версия кода: фигура зависит не только от данных, но и от функции
+    if module_name not in _source_hashes:
+        module = sys.modules.get(module_name)
+        source = getattr(module, "__file__", None)
+        digest = hashlib.sha256()
+        if source and os.path.exists(source):
+            digest.update(Path(source).read_bytes())
+        _source_hashes[module_name] = digest.hexdigest()
+    return _source_hashes[module_name]
+
+
+def _hash_value(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(b"df")
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(repr([str(t) for t in value.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(b"series")
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(b"array")
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for k in sorted(value, key=repr):
+            _hash_value(digest, k)
+            _hash_value(digest, value[k])
+    else:
+        digest.update(repr(value).encode())
+
+
+def figure_key(func, args=(), kwargs=None):
+    """
+    Ключ фигуры: содержимое DataFrame (hash_pandas_object) + аргументы
+    вызова + исходный код модуля функции
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+    digest.update(_module_hash(func.__module__).encode())
+    _hash_value(digest, tuple(args))
+    _hash_value(digest, dict(kwargs or {}))
+    return digest.hexdigest()
+
+
+def render_key(fig_json, fmt, width=None, height=None, scale=1):
+    """
+    Ключ картинки: сам JSON фигуры и параметры рендеринга
+    """
+    digest = hashlib.sha256()
+    digest.update(fig_json.encode())
+    digest.update(repr((fmt, width, height, scale)).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Кэш на диске с адресацией по содержимому: <root>/<ключ[:2]>/<ключ>/ —
+    JSON фигуры и/или отрисованные картинки. Записи пишутся атомарно
+    (временный файл + os.replace), поэтому кэшем могут пользоваться
+    несколько процессов. При превышении max_bytes вытесняются записи,
+    которые дольше всех не читались. Размер кэша обходом каталога считается
+    только при первой записи и когда оценка (тот размер плюс записанное
+    с тех пор этим объектом) превысит max_bytes.
+    """
+
+    def __init__(self, root, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def _entry(self, key):
+        return self.root / key[:2] / key
+
+    def _touch(self, entry):
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _read(self, key, filename):
+        entry = self._entry(key)
+        target = entry / filename
+        if not target.exists():
+            with self._lock:
+                self.misses += 1
+            return None
+        self._touch(entry)
+        with self._lock:
+            self.hits += 1
+        return target
+
+    def _store(self, key, filename, write):
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        tmp = entry / f".{filename}.{uuid.uuid4().hex}.tmp"
+        try:
+            write(tmp)
+            added = tmp.stat().st_size
+            try:
+                added -= (entry / filename).stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp, entry / filename)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._touch(entry)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += added
+            full = self._size is None or self._size > self.max_bytes
+        if full:
+            self.evict()
+        return entry / filename
+
+    # --- фигуры ---
+    def get_figure(self, key):
+        """JSON фигуры или None"""
+        target = self._read(key, FIGURE_FILE)
+        if target is None:
+            return None
+        try:
+            return target.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            # запись вытеснил другой процесс между проверкой и чтением
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+    def put_figure(self, key, fig_json):
+        return self._store(
+            key, FIGURE_FILE,
+            lambda tmp: tmp.write_text(fig_json, encoding="utf-8")
+        )
+
+    # --- картинки ---
+    def get_image(self, key, fmt):
+        """Путь к картинке в кэше или None"""
+        return self._read(key, f"image.{fmt}")
+
+    def put_image(self, key, fmt, path):
+        return self._store(
+            key, f"image.{fmt}",
+            lambda tmp: shutil.copyfile(path, tmp)
+        )
+
+    # --- размер и вытеснение ---
+    def _entries(self):
+        entries = []
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                try:
+                    size = sum(f.stat().st_size for f in entry.iterdir())
+                    entries.append((entry.stat().st_mtime, size, entry))
+                except OSError:
+                    # запись удалил другой процесс
+                    continue
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Обходит кэш и вытесняет записи сверх max_bytes; число удалённых"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._size = total
+        return removed
+
+    def clear(self):
+        for shard in self.root.iterdir():
+            if shard.is_dir():
+                shutil.rmtree(shard, ignore_errors=True)
+        with self._lock:
+            self._size = 0
+
+    def info(self):
+        entries = self._entries()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __repr__(self):
+        return f"FigureCache({str(self.root)!r}, max_bytes={self.max_bytes})"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """sha256 файла (для ключей входных данных)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(*modules):
+    """sha256 исходников модулей — версия кода для ключей"""
+    digest = hashlib.sha256()
+    for name in modules:
+        digest.update(_module_hash(name).encode())
+    return digest.hexdigest()
+
+
+def dump_key(value):
+    """Короткий стабильный ключ для JSON-совместимых параметров"""
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=repr).encode()
+    ).hexdigest()
@@ -0,0 +1,226 @@
+import threading
+from collections import OrderedDict
+
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# --- словари токенов многозначных полей ("Strike/Protest") ---
+# общие на процесс: каждая уникальная строка режется на токены один раз,
+# дальше матрицы событие × токен собираются из готовых номеров.
+# Не больше VOCABULARIES_MAX словарей (LRU); словарь, в котором больше
+# VOCABULARY_MAX_VALUES строк, заменяется новым — готовые матрицы и кубы
+# держат ссылку на свой словарь, номера в них не меняются
+VOCABULARIES_MAX = 16
+VOCABULARY_MAX_VALUES = 200_000
+
+_vocabularies = OrderedDict()
+_vocabularies_lock = threading.Lock()
+
+
+class TokenVocabulary:
+    def __init__(self, sep="/"):
+        self.sep = sep
+        self.tokens = []
+        self.index = {}
+        self.rows = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _token_id(self, token):
+        tid = self.index.get(token)
+        if tid is None:
+            tid = len(self.tokens)
+            self.index[token] = tid
+            self.tokens.append(token)
+        return tid
+
+    def _encode(self, value):
+        row = self.rows.get(value)
+        if row is None:
+            row = np.array(
+                [self._token_id(part.strip()) for part in value.split(self.sep)],
+                dtype=np.int32
+            )
+            self.rows[value] = row
+        return row
+
+    def encode(self, value):
+        with self._lock:
+            return self._encode(value)
+
+    def encode_all(self, values, skip_empty=True):
+        # одна блокировка на все уникальные значения
+        empty = np.empty(0, dtype=np.int32)
+        with self._lock:
+            return [
+                empty if (skip_empty and value == "") else self._encode(value)
+                for value in values
+            ]
+
+
+def get_vocabulary(field, sep="/"):
+    with _vocabularies_lock:
+        key = (field, sep)
+        vocab = _vocabularies.get(key)
+        if vocab is None or len(vocab) > VOCABULARY_MAX_VALUES:
+            vocab = _vocabularies[key] = TokenVocabulary(sep)
+        _vocabularies.move_to_end(key)
+        while len(_vocabularies) > VOCABULARIES_MAX:
+            _vocabularies.popitem(last=False)
+        return vocab
+
+
+def clear_vocabularies():
+    with _vocabularies_lock:
+        _vocabularies.clear()
+
+
+class TokenIncidence:
+    """
+    Разреженная матрица событие × токен (CSR: indptr, indices).
+    Строка i — токены i-го события; повтор токена в строке считается дважды,
+    как и при разбиении строки вручную.
+    """
+
+    def __init__(self, indptr, indices, vocabulary):
+        self.indptr = indptr
+        self.indices = indices
+        self.vocabulary = vocabulary
+
+    @property
+    def shape(self):
+        return (len(self.indptr) - 1, len(self.vocabulary.tokens))
+
+    @property
+    def tokens(self):
+        return self.vocabulary.tokens[:self.shape[1]]
+
+    def row_ids(self):
+        # номер события для каждого ненулевого элемента
+        return np.repeat(
+            np.arange(self.shape[0]),
+            np.diff(self.indptr)
+        )
+
+    def rows(self, positions):
+        """Подматрица из строк positions (номера или булева маска)"""
+        positions = np.asarray(positions)
+        if positions.dtype == bool:
+            positions = np.flatnonzero(positions)
+
+        starts = self.indptr[positions]
+        lengths = self.indptr[positions + 1] - starts
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        gather = (
+            np.arange(indptr[-1])
+            - np.repeat(indptr[:-1], lengths)
+            + np.repeat(starts, lengths)
+        )
+
+        return TokenIncidence(indptr, self.indices[gather], self.vocabulary)
+
+    def extend(self, other):
+        """Матрица, в которой после своих строк идут строки other (тот же словарь)"""
+        return TokenIncidence(
+            np.concatenate([self.indptr, self.indptr[-1] + other.indptr[1:]]),
+            np.concatenate([self.indices, other.indices]),
+            self.vocabulary
+        )
+
+    def count_by(self, codes, n_groups, weights=None):
+        """
+        Gᵀ·M: плотная матрица (группа × токен) для номеров групп codes
+        (по одному на событие, -1 — событие не учитывается)
+        """
+        n_tokens = self.shape[1]
+        row_ids = self.row_ids()
+        group = np.asarray(codes)[row_ids]
+        keep = group >= 0
+
+        flat = group[keep] * n_tokens + self.indices[keep]
+        w = None if weights is None else np.asarray(weights, dtype=float)[row_ids][keep]
+
+        counts = np.bincount(flat, weights=w, minlength=n_groups * n_tokens)
+        return counts.reshape(n_groups, n_tokens)
+
+    def token_counts(self, weights=None):
+        counts = self.count_by(np.zeros(self.shape[0], dtype=np.int64), 1, weights)[0]
+        return pd.Series(counts, index=self.tokens)
+
+    def to_scipy(self):
+        from scipy.sparse import csr_matrix
+
+        data = np.ones(len(self.indices), dtype=np.int32)
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+
+def token_incidence(
+    values,
+    field=None,
+    sep="/",
+    fill=None,
+    skip_empty=True,
+    vocabulary=None
+):
+    """
+    Матрица событие × токен для Series многозначного поля.
+    NaN (если не задан fill) и, при skip_empty, пустые строки дают пустую строку матрицы.
+    vocabulary — свой словарь вместо общего (номера токенов согласованы с ним).
+    """
+    vocab = vocabulary if vocabulary is not None else get_vocabulary(field or values.name, sep)
+
+    if fill is not None:
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        values = values.fillna(fill)
+
+    codes, uniques = pd.factorize(values)
+    empty = np.empty(0, dtype=np.int32)
+    per_unique = vocab.encode_all(np.asarray(uniques, dtype=object), skip_empty)
+
+    lengths = np.array([len(row) for row in per_unique], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    flat = np.concatenate(per_unique) if per_unique else empty
+
+    valid = codes >= 0
+    row_len = np.zeros(len(codes), dtype=np.int64)
+    row_len[valid] = lengths[codes[valid]]
+    row_start = np.zeros(len(codes), dtype=np.int64)
+    row_start[valid] = offsets[codes[valid]]
+
+    indptr = np.concatenate([[0], np.cumsum(row_len)])
+    gather = (
+        np.arange(indptr[-1])
+        - np.repeat(indptr[:-1], row_len)
+        + np.repeat(row_start, row_len)
+    )
+
+    return TokenIncidence(indptr, flat[gather].astype(np.int32), vocab)
+
+
+# --- готовые матрицы таблицы событий из общего кэша ---
+# data_loading регистрирует функцию (df, field, sep, fill, skip_empty) →
+# TokenIncidence строк df или None (df не из кэша — матрица строится заново)
+_table_source = None
+
+
+def set_table_incidence_source(func):
+    global _table_source
+    _table_source = func
+
+
+def table_incidence(df, field, sep="/", fill=None, skip_empty=True):
+    """
+    Матрица событие × токен для строк df: для таблиц из dl.load_strikes_table /
+    dl.load_strikes_df (и их подвыборок строк) — срез матрицы, построенной
+    один раз на всю таблицу, иначе token_incidence(df[field])
+    """
+    if _table_source is not None:
+        incidence = _table_source(df, field, sep, fill, skip_empty)
+        if incidence is not None:
+            return incidence
+    return token_incidence(df[field], field, sep=sep, fill=fill, skip_empty=skip_empty)
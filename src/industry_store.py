@@ -0,0 +1,176 @@
+import threading
+
+from ._lazy import lazy_import
+from .analysis import INDUSTRY_COLUMNS, NORMALIZE_INDUSTRIES, SECTOR_MAPPING_2013_TO_2023
+from .yearbook import YEARBOOK_PATH, yearbook_table
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# колонки таблицы economic → колонки отраслевых таблиц (Business Revenue там нет)
+ECONOMIC_COLUMNS = {
+    "Number": "Enterprises",
+    "TotalOutput": "Output Value",
+    "Профит": "Total Profits",
+    "Workers": "Employed Persons",
+}
+
+# имена, которых нет ни в NORMALIZE_INDUSTRIES, ни в SECTOR_MAPPING_2013_TO_2023
+SECTOR_ALIASES = {
+    "Automobile Manufacturing": "Manufacture of Automobile",
+    "Cultural, Educational and Sports Goods": "Manufacture of Cultural, Educational, Sports and Entertainment Articles",
+}
+
+_SECTOR_KEYS = {
+    NORMALIZE_INDUSTRIES.get(name, name): key
+    for name, key in SECTOR_MAPPING_2013_TO_2023.items()
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def sector_key(name):
+    """
+    Единое имя отрасли для всех лет — номенклатура таблиц 2003/2013
+    """
+    if name in SECTOR_MAPPING_2013_TO_2023:
+        return SECTOR_MAPPING_2013_TO_2023[name]
+    name = NORMALIZE_INDUSTRIES.get(name, name)
+    name = SECTOR_ALIASES.get(name, name)
+    return _SECTOR_KEYS.get(name, name)
+
+
+class IndustryStore:
+    """
+    Отраслевая статистика ежегодников за все годы: длинная панель
+    (year, Sector, показатели) и индекс (год, отрасль) → строка.
+    Sector — единое имя (sector_key), исходное имя из ежегодника —
+    в Sector_source, поэтому таблицы любых двух лет сливаются по Sector.
+    """
+
+    def __init__(self, panel):
+        panel = panel.sort_values("year", kind="stable").reset_index(drop=True)
+        self.panel = panel
+        self._values = panel[INDUSTRY_COLUMNS].to_numpy(dtype=float)
+        self._columns = {col: i for i, col in enumerate(INDUSTRY_COLUMNS)}
+        self._rows = {
+            (year, sector): i
+            for i, (year, sector) in enumerate(zip(panel["year"].tolist(), panel["Sector"].tolist()))
+        }
+
+        years = panel["year"].to_numpy()
+        self.years = sorted(set(years.tolist()))
+        starts = np.searchsorted(years, self.years, side="left")
+        stops = np.searchsorted(years, self.years, side="right")
+        self._slices = {
+            year: slice(int(start), int(stop))
+            for year, start, stop in zip(self.years, starts, stops)
+        }
+
+    def __contains__(self, key):
+        year, sector = key
+        return (year, sector_key(sector)) in self._rows
+
+    def _row(self, year, sector):
+        row = self._rows.get((year, sector_key(sector)))
+        if row is None:
+            raise KeyError((year, sector))
+        return row
+
+    def value(self, year, sector, column):
+        """Один показатель по (год, отрасль); отрасль — любое из её имён"""
+        return self._values[self._row(year, sector), self._columns[column]]
+
+    def get(self, year, sector):
+        """Все показатели по (год, отрасль) словарём"""
+        values = self._values[self._row(year, sector)]
+        return dict(zip(INDUSTRY_COLUMNS, values.tolist()))
+
+    def sectors(self, year):
+        return self.panel["Sector"].iloc[self._year_slice(year)].tolist()
+
+    def _year_slice(self, year):
+        rows = self._slices.get(year)
+        if rows is None:
+            raise ValueError(f"no industry data for {year}")
+        return rows
+
+    def frame(self, year, source_names=False):
+        """
+        Таблица одного года в виде load_industry_data: Sector + показатели
+        """
+        columns = ["Sector_source" if source_names else "Sector"] + INDUSTRY_COLUMNS
+        return (
+            self.panel.iloc[self._year_slice(year)][columns]
+            .rename(columns={"Sector_source": "Sector"})
+            .reset_index(drop=True)
+        )
+
+    def long(self, years=None, sectors=None):
+        """Длинная панель за несколько лет (по умолчанию — за все)"""
+        panel = self.panel
+        if years is not None:
+            for year in years:
+                self._year_slice(year)
+            panel = panel[panel["year"].isin(list(years))]
+        if sectors is not None:
+            panel = panel[panel["Sector"].isin([sector_key(s) for s in sectors])]
+        return panel.reset_index(drop=True)
+
+    def __repr__(self):
+        return f"IndustryStore({len(self.panel)} rows, years {self.years[0]}–{self.years[-1]})"
+
+
+def _economic_panel(economic):
+    df = economic.rename(columns={"Отрасль": "Sector_source", **ECONOMIC_COLUMNS})
+    df["year"] = df["год"].astype(int)
+    df["Sector"] = df["Sector_source"].map(sector_key)
+    df["Business Revenue"] = np.nan
+
+    # после нормализации несколько исходных строк могут стать одной отраслью
+    grouped = df.groupby(["year", "Sector"], sort=False)
+    out = grouped[INDUSTRY_COLUMNS].sum(min_count=1)
+    out["Sector_source"] = grouped["Sector_source"].agg(" + ".join)
+    return out.reset_index()
+
+
+def build_industry_store(industry, economic):
+    """
+    Панель из отраслевых таблиц (industry) и многолетней таблицы economic:
+    годы, которые есть в industry, берутся оттуда целиком, остальные —
+    из economic
+    """
+    detailed = industry.rename(columns={"Sector": "Sector_source"})
+    detailed["Sector"] = detailed["Sector_source"].map(sector_key)
+    detailed[INDUSTRY_COLUMNS] = detailed[INDUSTRY_COLUMNS].astype(float)
+
+    economic = _economic_panel(economic)
+    economic = economic[~economic["year"].isin(detailed["year"].unique())]
+
+    columns = ["year", "Sector", "Sector_source"] + INDUSTRY_COLUMNS
+    return IndustryStore(
+        pd.concat([detailed[columns], economic[columns]], ignore_index=True)
+    )
+
+
+def industry_store(path=YEARBOOK_PATH):
+    """
+    Общий (на процесс) IndustryStore по ежегоднику; строится один раз
+    """
+    key = str(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            if key not in _stores:
+                _stores[key] = build_industry_store(
+                    yearbook_table("industry", path),
+                    yearbook_table("economic", path)
+                )
+            store = _stores[key]
+    return store
+
+
+def clear_industry_store_cache():
+    with _stores_lock:
+        _stores.clear()
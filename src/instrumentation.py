@@ -0,0 +1,307 @@
+"""
+Замеры по стадиям (загрузка → анализ → графики), включаются явно:
+
+    from src import instrumentation as ins
+
+    with ins.tracing():
+        df = dl.load_strikes_df(path)
+        an.prepare_demands(df)
+
+    ins.summary()                     # таблица по функциям
+    ins.write_chrome_trace("trace.json")    # chrome://tracing, Perfetto, speedscope
+    ins.write_folded_stacks("trace.folded") # flamegraph.pl, speedscope
+
+или переменной окружения STRIKES_TRACE=1. Каждый вызов публичной функции
+data_loading / analysis / plots — отрезок (span): время, процессорное время,
+прирост пикового RSS, строки на входе и выходе; вложенные вызовы — дочерние
+отрезки. Выключенные замеры стоят одну проверку флага на вызов.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager, nullcontext
+
+from ._lazy import lazy_import
+
+json = lazy_import("json")
+pd = lazy_import("pandas")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_enabled = os.environ.get("STRIKES_TRACE", "") not in ("", "0")
+
+_spans = []
+_spans_lock = threading.Lock()
+_local = threading.local()
+
+# общая шкала времени для процессов: часы стены + монотонный счётчик
+_anchor_ns = time.time_ns()
+_anchor_perf = time.perf_counter_ns()
+
+_NULL = nullcontext()
+
+
+def _now_ns():
+    return _anchor_ns + (time.perf_counter_ns() - _anchor_perf)
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS отдаёт байты, Linux — килобайты
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, list)):
+        return len(value)
+    if hasattr(value, "shape") and getattr(value, "ndim", 0) >= 1:
+        return value.shape[0]
+    return None
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _spans_lock:
+        _spans.clear()
+
+
+@contextmanager
+def tracing(reset_spans=True):
+    """Включает замеры на время блока"""
+    global _enabled
+    if reset_spans:
+        reset()
+    previous, _enabled = _enabled, True
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+class _Span:
+    __slots__ = ("name", "rows_in", "rows_out", "start", "cpu", "rss", "children")
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        stack = _stack()
+        stack.append(self)
+        self.children = 0
+        self.rss = _peak_rss_kb()
+        self.cpu = time.thread_time_ns()
+        self.start = _now_ns()
+        return self
+
+    def __exit__(self, *exc):
+        wall = _now_ns() - self.start
+        cpu = time.thread_time_ns() - self.cpu
+        rss = _peak_rss_kb()
+
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += wall
+
+        record = {
+            "name": self.name,
+            "stack": ";".join([s.name for s in stack] + [self.name]),
+            "depth": len(stack),
+            "ts_ns": self.start,
+            "wall_ns": wall,
+            "self_ns": wall - self.children,
+            "cpu_ns": cpu,
+            "peak_rss_delta_kb": None if rss is None else rss - self.rss,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        with _spans_lock:
+            _spans.append(record)
+        return False
+
+
+def trace(name, rows_in=None):
+    """
+    Контекст-менеджер для стадии внутри функции:
+
+        with trace("json.load"):
+            data = json.load(f)
+    """
+    if not _enabled:
+        return _NULL
+    return _Span(name, rows_in)
+
+
+def span(func=None, name=None):
+    """Декоратор: каждый вызов функции — отдельный отрезок"""
+    if func is None:
+        return functools.partial(span, name=name)
+
+    label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        rows_in = None
+        for value in args:
+            rows_in = _rows(value)
+            if rows_in is not None:
+                break
+
+        with _Span(label, rows_in) as s:
+            result = func(*args, **kwargs)
+            s.rows_out = _rows(result)
+        return result
+
+    wrapper.__wrapped_span__ = True
+    return wrapper
+
+
+def instrument_module(module):
+    """
+    Оборачивает все публичные функции, определённые в модуле
+    """
+    for attr, value in list(vars(module).items()):
+        if (
+            attr.startswith("_")
+            or not isinstance(value, types.FunctionType)
+            or value.__module__ != module.__name__
+            or getattr(value, "__wrapped_span__", False)
+        ):
+            continue
+        setattr(module, attr, span(value))
+    return module
+
+
+# --- результаты ---
+def spans():
+    with _spans_lock:
+        return list(_spans)
+
+
+def extend(records):
+    """Добавляет отрезки из другого процесса (рабочие процессы конвейера)"""
+    with _spans_lock:
+        _spans.extend(records)
+
+
+def drain():
+    """Забирает накопленные отрезки и очищает буфер"""
+    with _spans_lock:
+        records = list(_spans)
+        _spans.clear()
+    return records
+
+
+def summary(records=None):
+    """
+    Сводка по функциям: число вызовов, суммарное и собственное время,
+    процессорное время, максимальный прирост пикового RSS, строки
+    """
+    records = spans() if records is None else records
+    columns = [
+        "name", "calls", "wall_ms", "self_ms", "cpu_ms",
+        "max_peak_rss_delta_mb", "rows_in", "rows_out",
+    ]
+    if not records:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(records)
+    out = (
+        df.groupby("name")
+        .agg(
+            calls=("name", "size"),
+            wall_ms=("wall_ns", "sum"),
+            self_ms=("self_ns", "sum"),
+            cpu_ms=("cpu_ns", "sum"),
+            max_peak_rss_delta_mb=("peak_rss_delta_kb", "max"),
+            rows_in=("rows_in", lambda s: s.sum(min_count=1)),
+            rows_out=("rows_out", lambda s: s.sum(min_count=1)),
+        )
+        .reset_index()
+    )
+    out[["rows_in", "rows_out"]] = out[["rows_in", "rows_out"]].astype("Int64")
+    for col in ("wall_ms", "self_ms", "cpu_ms"):
+        out[col] = out[col] / 1e6
+    out["max_peak_rss_delta_mb"] = out["max_peak_rss_delta_mb"] / 1024
+
+    return out.sort_values("self_ms", ascending=False)[columns].reset_index(drop=True)
+
+
+def chrome_trace(records=None):
+    """События в формате Chrome Trace (ph="X", микросекунды)"""
+    records = spans() if records is None else records
+    events = []
+    for r in records:
+        events.append({
+            "name": r["name"],
+            "cat": r["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": r["ts_ns"] / 1e3,
+            "dur": r["wall_ns"] / 1e3,
+            "pid": r["pid"],
+            "tid": r["tid"],
+            "args": {
+                "cpu_ms": r["cpu_ns"] / 1e6,
+                "peak_rss_delta_kb": r["peak_rss_delta_kb"],
+                "rows_in": r["rows_in"],
+                "rows_out": r["rows_out"],
+            },
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path, records=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(records), f)
+    return path
+
+
+def write_folded_stacks(path, records=None):
+    """
+    Свёрнутые стеки ("a;b;c <мкс собственного времени>") для flamegraph.pl
+    """
+    records = spans() if records is None else records
+    totals = {}
+    for r in records:
+        totals[r["stack"]] = totals.get(r["stack"], 0) + r["self_ns"]
+
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, ns in totals.items():
+            f.write(f"{stack} {max(ns // 1000, 0)}\n")
+    return path
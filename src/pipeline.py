@@ -0,0 +1,556 @@
+"""
+Полный прогон всех анализов (ноутбуки 01–15) одной командой:
+
+    python -m src.pipeline --data data/chinese_strikes.json --out output --workers 8
+
+Общие входные данные (таблица событий, экономические и отраслевые данные)
+загружаются один раз в родительском процессе и передаются рабочим процессам;
+анализы выполняются параллельно по графу зависимостей, результаты
+пишутся в --out/<анализ>/*.csv. С --formats png svg ... графики рисуются
+постоянным пулом рендеринга (FigureExporter) в --out/<анализ>/.
+
+Повторный прогон на тех же данных и том же коде не пересчитывает анализы:
+ключ анализа (sha256 файла данных + исходников + форматов) сверяется
+с manifest.json прошлого прогона (--force — пересчитать всё). С --cache DIR
+фигуры и картинки берутся из кэша с адресацией по содержимому (FigureCache).
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from . import analysis as an
+from . import data_loading as dl
+from . import instrumentation as ins
+from . import plots
+from ._lazy import lazy_import
+from .export import FigureExporter
+from .figure_cache import FigureCache, dump_key, file_digest, source_digest
+
+argparse = lazy_import("argparse")
+futures = lazy_import("concurrent.futures")
+json = lazy_import("json")
+pd = lazy_import("pandas")
+
+
+# --- общие входные данные: (зависимости, функция(path, deps)) ---
+def _input_table(path, deps):
+    return dl.load_strikes_table(path)
+
+
+def _input_events(path, deps):
+    dl.install_strikes_table(path, deps["table"])
+    return dl.load_strikes_df(path)
+
+
+def _input_economic(path, deps):
+    return dl.load_economic_data()
+
+
+def _input_gdp(path, deps):
+    return dl.load_gdp_composition()
+
+
+def _input_wages(path, deps):
+    return dl.load_wages()
+
+
+def _input_industry(path, deps):
+    return {year: dl.load_industry_data(year) for year in (2003, 2013, 2023)}
+
+
+INPUTS = {
+    "table": ((), _input_table),
+    "events": (("table",), _input_events),
+    "economic": ((), _input_economic),
+    "gdp": ((), _input_gdp),
+    "wages": ((), _input_wages),
+    "industry": ((), _input_industry),
+}
+
+
+# --- анализы: каждый возвращает {имя таблицы: DataFrame} ---
+def _strikes(path, inputs):
+    return {"strikes_by_year": dl.load_strikes_from_json(path)}
+
+
+def _strikes_by_cities(path, inputs):
+    return {"strikes_by_year_and_city": an.prepare_strikes_by_year_and_city(inputs["events"])}
+
+
+def _strikes_by_industries(path, inputs):
+    events = inputs["events"]
+    return {
+        "strikes_by_year_and_industry": an.prepare_strikes_by_year_and_category(events, "Industry"),
+        "strikes_by_year_and_subindustry": an.prepare_strikes_by_year_and_category(events, "subIndustry_name"),
+    }
+
+
+def _strikes_by_size(path, inputs):
+    events = inputs["events"]
+    return {
+        "strikes_by_size": an.prepare_strikes_by_size(events),
+        "strikes_by_size_guangdong": an.prepare_strikes_by_size(events, "Guangdong"),
+    }
+
+
+def _economic_indicators(path, inputs):
+    return {"economic_indicators": an.prepare_economic_indicators(inputs["economic"])}
+
+
+def _gdp_composition(path, inputs):
+    return {"gdp_composition": an.prepare_gdp_composition(inputs["gdp"].copy())}
+
+
+def _wages(path, inputs):
+    return {"wages": inputs["wages"]}
+
+
+def _demands(path, inputs):
+    return {"demands": an.prepare_demands(inputs["events"])}
+
+
+def _strikes_by_state_and_demands(path, inputs):
+    return {"strikes_by_state_and_demand": an.prepare_strikes_by_state_and_demand(inputs["events"])}
+
+
+def _action_types_pie(path, inputs):
+    return {"action_types": dl.load_action_types_from_json(path)}
+
+
+def _action_by_state_and_type(path, inputs):
+    return {"action_by_state_and_type": an.prepare_action_by_state_and_type(inputs["events"])}
+
+
+def _strikes_by_state_and_response(path, inputs):
+    return {"strikes_by_state_and_response": an.prepare_strikes_by_state_and_response(inputs["events"])}
+
+
+def _industries_sunbursts(path, inputs):
+    rows = an.prepare_industries(dl.load_strikes_by_industries(path))
+    return {
+        "industries": pd.DataFrame(
+            [
+                (industry, sub, count)
+                for industry, subs in rows
+                for sub, count in subs
+            ],
+            columns=["Industry", "subIndustry_name", "total_strikes"]
+        )
+    }
+
+
+def _strikes_by_state_and_industry(path, inputs):
+    return {"strikes_by_state_and_industry": an.prepare_strikes_by_state_and_industry(inputs["events"])}
+
+
+def _structural_labor_power(path, inputs):
+    industry = inputs["industry"]
+    return {
+        "strike_leverage_2003_2013": an.build_strike_table(industry[2003], industry[2013], 2003, 2013),
+        "strike_leverage_2013_2023": an.build_strike_table(industry[2013], industry[2023], 2013, 2023),
+    }
+
+
+ANALYSES = {
+    "01_strikes": (("table",), _strikes),
+    "02_strikes_by_cities": (("events",), _strikes_by_cities),
+    "03_strikes_by_industries": (("events",), _strikes_by_industries),
+    "04_strikes_by_size": (("events",), _strikes_by_size),
+    "05_economic_indicators": (("economic",), _economic_indicators),
+    "06_gdp_composition": (("gdp",), _gdp_composition),
+    "07_wages": (("wages",), _wages),
+    "08_demands": (("events",), _demands),
+    "09_strikes_by_state_and_demands": (("events",), _strikes_by_state_and_demands),
+    "10_action_types_pie": (("table",), _action_types_pie),
+    "11_action_by_state_and_type": (("events",), _action_by_state_and_type),
+    "12_strikes_by_state_and_response": (("events",), _strikes_by_state_and_response),
+    "13_industries_sunbursts": (("table",), _industries_sunbursts),
+    "14_strikes_by_state_and_industry": (("events",), _strikes_by_state_and_industry),
+    "15_structural_labor_power": (("industry",), _structural_labor_power),
+}
+
+
+# --- графики: {имя графика: go.Figure} по таблицам анализа ---
+def _figures_strikes(tables):
+    return {"strikes_over_time": plots.plot_strikes_over_time(tables["strikes_by_year"])}
+
+
+def _figures_strikes_by_cities(tables):
+    df = tables["strikes_by_year_and_city"].rename(columns={"Year": "year"})
+    return {"strikes_by_city": plots.plot_strikes_by_city(df)}
+
+
+def _figures_strikes_by_industries(tables):
+    return {
+        "strikes_by_industry": plots.plot_strikes_by_industry(tables["strikes_by_year_and_industry"]),
+        "strikes_by_subindustry": plots.plot_strikes_by_subindustry(tables["strikes_by_year_and_subindustry"]),
+    }
+
+
+def _figures_strikes_by_size(tables):
+    return {
+        "strikes_by_size": plots.plot_strikes_by_size(
+            tables["strikes_by_size"],
+            tables["strikes_by_size_guangdong"],
+            "Strikes by enterprise size"
+        )
+    }
+
+
+def _figures_economic_indicators(tables):
+    df = tables["economic_indicators"]
+    top = (
+        df.groupby("Industry_norm")["Workers_real"].sum()
+        .nlargest(5).index.tolist()
+    )
+    return {
+        "economic_indicators": plots.plot_indicators(
+            df,
+            {
+                "Profit_per_worker": "Profit per worker, yuan",
+                "Workers_real": "Employed persons",
+                "TotalOutput": "Total output",
+                "Workers_per_enterprise": "Workers per enterprise",
+            },
+            top
+        ),
+    }
+
+
+def _figures_gdp_composition(tables):
+    return {"gdp_composition": plots.plot_gdp(tables["gdp_composition"])}
+
+
+def _figures_wages(tables):
+    return {"wages": plots.plot_wages(tables["wages"])}
+
+
+def _figures_demands(tables):
+    return {"demands": plots.plot_demands(tables["demands"])}
+
+
+def _figures_strikes_by_state_and_demands(tables):
+    return {"strikes_by_state_and_demand": plots.plot_strikes_by_state_and_demand(tables["strikes_by_state_and_demand"])}
+
+
+def _figures_action_types_pie(tables):
+    return {"action_types": plots.plot_action_types_pie(tables["action_types"])}
+
+
+def _figures_action_by_state_and_type(tables):
+    return {"action_by_state_and_type": plots.plot_action_by_state_and_type(tables["action_by_state_and_type"])}
+
+
+def _figures_strikes_by_state_and_response(tables):
+    return {"strikes_by_state_and_response": plots.plot_strikes_by_response_and_state(tables["strikes_by_state_and_response"])}
+
+
+def _figures_industries_sunbursts(tables):
+    df = tables["industries"]
+    rows = [
+        (industry, list(zip(group["subIndustry_name"], group["total_strikes"])))
+        for industry, group in df.groupby("Industry", sort=False)
+    ]
+    return {"industries_sunburst": plots.plot_sunburst(rows, "Strikes by industry")}
+
+
+def _figures_strikes_by_state_and_industry(tables):
+    return {"strikes_by_state_and_industry": plots.plot_strikes_by_state_and_industry(tables["strikes_by_state_and_industry"])}
+
+
+def _figures_structural_labor_power(tables):
+    return {
+        name.replace("strike_leverage", "industry_vulnerability"): plots.plot_industry_vulnerability(
+            table, f"Structural labor power {name[-9:].replace('_', '–')}"
+        )
+        for name, table in tables.items()
+    }
+
+
+FIGURES = {
+    "01_strikes": _figures_strikes,
+    "02_strikes_by_cities": _figures_strikes_by_cities,
+    "03_strikes_by_industries": _figures_strikes_by_industries,
+    "04_strikes_by_size": _figures_strikes_by_size,
+    "05_economic_indicators": _figures_economic_indicators,
+    "06_gdp_composition": _figures_gdp_composition,
+    "07_wages": _figures_wages,
+    "08_demands": _figures_demands,
+    "09_strikes_by_state_and_demands": _figures_strikes_by_state_and_demands,
+    "10_action_types_pie": _figures_action_types_pie,
+    "11_action_by_state_and_type": _figures_action_by_state_and_type,
+    "12_strikes_by_state_and_response": _figures_strikes_by_state_and_response,
+    "13_industries_sunbursts": _figures_industries_sunbursts,
+    "14_strikes_by_state_and_industry": _figures_strikes_by_state_and_industry,
+    "15_structural_labor_power": _figures_structural_labor_power,
+}
+
+
+# --- рабочий процесс ---
+_worker = {}
+
+
+def _init_worker(path, out_dir, inputs, figures, cache_dir, traced):
+    _worker.update(path=path, out_dir=out_dir, inputs=inputs, figures=figures)
+    if traced:
+        # при fork рабочий процесс наследует замеры родителя — иначе
+        # drain() вернул бы их ещё раз вместе со своими
+        ins.reset()
+        ins.enable()
+    plots.set_output("return")
+    if cache_dir is not None:
+        plots.set_cache(FigureCache(cache_dir))
+    if "table" in inputs:
+        # рабочий процесс не разбирает JSON заново
+        dl.install_strikes_table(path, inputs["table"])
+
+
+def _run_analysis(name):
+    started = time.perf_counter()
+    _, func = ANALYSES[name]
+
+    with ins.trace(f"pipeline.{name}"):
+        tables = func(_worker["path"], _worker["inputs"])
+
+        out = Path(_worker["out_dir"]) / name
+        out.mkdir(parents=True, exist_ok=True)
+        files = []
+        with ins.trace("to_csv"):
+            for table_name, table in tables.items():
+                target = out / f"{table_name}.csv"
+                table.to_csv(target, index=False)
+                files.append(str(target))
+
+        # фигуры уходят в родительский процесс как JSON — рисует общий пул
+        figures = {}
+        if _worker["figures"]:
+            for fig_name, fig in FIGURES[name](tables).items():
+                with ins.trace("plotly.to_json"):
+                    figures[fig_name] = fig.to_json()
+
+    return {
+        "files": files,
+        "figures": figures,
+        "seconds": time.perf_counter() - started,
+        # отрезки рабочего процесса сводятся в родительском
+        "spans": ins.drain() if ins.is_enabled() else [],
+    }
+
+
+def _load_inputs(path, names):
+    # входные данные — в порядке зависимостей, каждое один раз
+    loaded = {}
+
+    def load(name):
+        if name in loaded:
+            return loaded[name]
+        deps, func = INPUTS[name]
+        loaded[name] = func(path, {dep: load(dep) for dep in deps})
+        return loaded[name]
+
+    for name in names:
+        load(name)
+    return loaded
+
+
+def _code_digest():
+    # все загруженные модули пакета и сам конвейер
+    modules = sorted(m for m in sys.modules if m.startswith(f"{__package__}."))
+    return source_digest(*modules, __name__)
+
+
+def _previous_manifest(out_dir):
+    try:
+        with open(Path(out_dir) / "manifest.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_fresh(result, key):
+    return (
+        result.get("key") == key
+        and not result.get("errors")
+        and all(Path(f).exists() for f in result.get("files", []))
+    )
+
+
+def run_pipeline(
+    path,
+    out_dir,
+    analyses=None,
+    workers=None,
+    formats=None,
+    render_workers=None,
+    render_timeout=60,
+    cache_dir=None,
+    force=False
+):
+    """
+    Выполняет анализы (по умолчанию все 15) на пуле процессов.
+    formats — форматы графиков (png, svg, html, ...); None — только таблицы.
+    Анализы, чьи результаты в out_dir посчитаны на тех же данных и коде,
+    не пересчитываются (force=True — пересчитать). cache_dir — кэш фигур.
+    Возвращает манифест {анализ: {"files": [...], "seconds": ..., "key": ...}};
+    ошибки анализа и его графиков — в "errors", остальные анализы выполняются.
+    """
+    path = str(Path(path).resolve())
+    names = list(ANALYSES) if analyses is None else list(analyses)
+
+    unknown = set(names) - set(ANALYSES)
+    if unknown:
+        raise ValueError(f"unknown analyses: {sorted(unknown)}")
+
+    data_digest = file_digest(path)
+    code_digest = _code_digest()
+    keys = {
+        name: dump_key({
+            "analysis": name,
+            "data": data_digest,
+            "code": code_digest,
+            "formats": sorted(formats or []),
+        })
+        for name in names
+    }
+
+    previous = {} if force else _previous_manifest(out_dir)
+    manifest = {}
+    for name in names:
+        if _is_fresh(previous.get(name, {}), keys[name]):
+            manifest[name] = dict(previous[name], cached=True)
+    names = [name for name in names if name not in manifest]
+
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    exporters = {}
+
+    if not names:
+        # всё уже посчитано — данные даже не загружаются
+        return _write_manifest(out_dir, previous, manifest)
+
+    needed = {dep for name in names for dep in ANALYSES[name][0]}
+    inputs = _load_inputs(path, needed)
+
+    if cache_dir is not None:
+        cache_dir = str(cache_dir)
+
+    with futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(path, str(out_dir), inputs, bool(formats), cache_dir, ins.is_enabled())
+    ) as pool:
+        submitted = time.perf_counter()
+        pending = {pool.submit(_run_analysis, name): name for name in names}
+        while pending:
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    # упавший анализ не останавливает остальные;
+                    # с errors он пересчитывается при следующем прогоне
+                    manifest[name] = {
+                        "files": [],
+                        "seconds": time.perf_counter() - submitted,
+                        "key": keys[name],
+                        "errors": [f"{name}: {exc!r}"],
+                    }
+                    continue
+                manifest[name] = result
+                result["key"] = keys[name]
+                ins.extend(result.pop("spans"))
+                figures = result.pop("figures")
+                if figures:
+                    # рендеринг идёт, пока считаются остальные анализы
+                    exporter = _exporter(
+                        exporters, out_dir, formats, render_workers, render_timeout, cache_dir
+                    )
+                    for fig_name, fig_json in figures.items():
+                        exporter.submit(fig_json, f"{name}/{fig_name}")
+
+    if exporters:
+        exporter = exporters["exporter"]
+        written, failed = exporter.join()
+        exporter.close()
+        for fig_name, files in written.items():
+            manifest[fig_name.split("/")[0]]["files"].extend(files)
+        for fig_name, error in failed.items():
+            manifest[fig_name.split("/")[0]].setdefault("errors", []).append(
+                f"{fig_name}: {error!r}"
+            )
+
+    return _write_manifest(out_dir, previous, manifest)
+
+
+def _write_manifest(out_dir, previous, manifest):
+    # анализы, не входившие в этот прогон (--only), остаются в манифесте
+    merged = {
+        name: {k: v for k, v in result.items() if k != "cached"}
+        for name, result in {**previous, **manifest}.items()
+    }
+    with open(Path(out_dir) / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False, indent=2)
+
+    return manifest
+
+
+def _exporter(exporters, out_dir, formats, workers, timeout, cache_dir):
+    if "exporter" not in exporters:
+        exporters["exporter"] = FigureExporter(
+            out_dir,
+            formats=formats,
+            workers=workers,
+            timeout=timeout,
+            cache=None if cache_dir is None else FigureCache(cache_dir)
+        )
+    return exporters["exporter"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all strike analyses")
+    parser.add_argument("--data", required=True, help="path to chinese_strikes.json")
+    parser.add_argument("--out", default="output", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--only", nargs="*", help="run only these analyses")
+    parser.add_argument("--formats", nargs="*", help="figure formats: png svg pdf html json ...")
+    parser.add_argument("--render-workers", type=int, default=None)
+    parser.add_argument("--render-timeout", type=float, default=60)
+    parser.add_argument("--cache", default=None, help="figure cache directory")
+    parser.add_argument("--force", action="store_true", help="recompute up-to-date analyses")
+    parser.add_argument(
+        "--trace", default=None,
+        help="write per-stage timings to TRACE.json (Chrome trace) and TRACE.folded"
+    )
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        ins.enable()
+
+    started = time.perf_counter()
+    manifest = run_pipeline(
+        args.data, args.out, args.only, args.workers,
+        formats=args.formats,
+        render_workers=args.render_workers,
+        render_timeout=args.render_timeout,
+        cache_dir=args.cache,
+        force=args.force
+    )
+
+    for name, result in manifest.items():
+        seconds = "cached" if result.get("cached") else f"{result['seconds']:6.2f}s"
+        print(f"{name:40s} {seconds:>8s}  {len(result['files'])} file(s)")
+        for error in result.get("errors", []):
+            print(f"    error: {error}")
+    print(f"total: {time.perf_counter() - started:.2f}s")
+
+    if args.trace:
+        ins.write_chrome_trace(f"{args.trace}.json")
+        ins.write_folded_stacks(f"{args.trace}.folded")
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(ins.summary().head(30).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
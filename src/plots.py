@@ -1,7 +1,139 @@
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-
+import functools
+import sys
+import threading
+
+from ._lazy import lazy_import
+from .downsample import decimate_positions
+from .figure_cache import figure_key
+from .instrumentation import instrument_module, trace
+
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+pio = lazy_import("plotly.io")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# --- куда отдаётся готовая фигура ---
+# "show" — fig.show() (по умолчанию, как в ноутбуках);
+# "return" — функция возвращает фигуру без показа;
+# "export" — фигура уходит в FigureExporter (src/export.py) и тоже возвращается
+_output = {"mode": "show", "exporter": None, "cache": None}
+
+# внутри _cached фигура только собирается, показ/экспорт — после кэша
+_capture = threading.local()
+
+# --- плотные ряды (дневные/недельные по городам) ---
+# больше webgl_points точек на фигуре — трейсы переводятся в WebGL (Scattergl);
+# в трейсе остаётся не больше max_points точек (прореживание LTTB)
+_density = {"webgl_points": 5000, "max_points": 2000}
+
+
+def set_output(mode="show", exporter=None):
+    if mode not in ("show", "return", "export"):
+        raise ValueError(f"unknown output mode: {mode}")
+    if mode == "export" and exporter is None:
+        raise ValueError("export mode needs a FigureExporter")
+    _output["mode"] = mode
+    _output["exporter"] = exporter
+
+
+def set_cache(cache=None):
+    """
+    Кэш фигур (FigureCache из src/figure_cache.py): повторный вызов с теми же
+    данными и аргументами берёт готовый JSON фигуры. None — без кэша.
+    """
+    _output["cache"] = cache
+
+
+def set_density(webgl_points=5000, max_points=2000):
+    """
+    Пороги режима высокой плотности; None отключает соответствующий шаг
+    """
+    _density["webgl_points"] = webgl_points
+    _density["max_points"] = max_points
+
+
+def _densify(fig):
+    """
+    Прореживает линейные трейсы до max_points точек (LTTB по x, y; customdata
+    и text — по тем же номерам) и переводит их в Scattergl, если точек на
+    фигуре больше webgl_points
+    """
+    max_points = _density["max_points"]
+    webgl_points = _density["webgl_points"]
+    # px.line сам переходит на scattergl после 1000 точек
+    scatters = [
+        t for t in fig.data
+        if t.type in ("scatter", "scattergl") and t.x is not None
+    ]
+
+    if max_points is not None:
+        for trace in scatters:
+            if len(trace.x) <= max_points:
+                continue
+            keep = decimate_positions(trace.x, trace.y, max_points)
+            updates = {"x": np.asarray(trace.x)[keep], "y": np.asarray(trace.y)[keep]}
+            for prop in ("customdata", "text", "hovertext"):
+                value = getattr(trace, prop)
+                if value is not None and not isinstance(value, str) and len(value) == len(trace.x):
+                    updates[prop] = np.asarray(value)[keep]
+            trace.update(updates)
+
+    total = sum(len(t.x) for t in scatters)
+    if webgl_points is None or total <= webgl_points:
+        return fig
+
+    dense = {id(t) for t in scatters if t.type == "scatter"}
+    traces = []
+    for trace in fig.data:
+        if id(trace) in dense:
+            props = trace.to_plotly_json()
+            props.pop("type", None)
+            trace = go.Scattergl(props, skip_invalid=True)
+        traces.append(trace)
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def _finish(fig, name):
+    if getattr(_capture, "active", False):
+        return fig
+    mode = _output["mode"]
+    if mode == "show":
+        fig.show()
+        return None
+    if mode == "export":
+        _output["exporter"].submit(fig, name)
+    return fig
+
+
+def _cached(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _output["cache"]
+        if cache is None:
+            return func(*args, **kwargs)
+
+        # пороги плотности тоже меняют фигуру
+        key = figure_key(func, args, dict(kwargs, _density=dict(_density)))
+        fig_json = cache.get_figure(key)
+        if fig_json is None:
+            _capture.active = True
+            try:
+                fig = func(*args, **kwargs)
+            finally:
+                _capture.active = False
+            with trace("plotly.to_json"):
+                fig_json = fig.to_json()
+            cache.put_figure(key, fig_json)
+        else:
+            fig = pio.from_json(fig_json)
+
+        return _finish(fig, func.__name__)
+
+    return wrapper
+
+
+@_cached
 def plot_strikes_over_time(df, title=None):
     fig = go.Figure()
 
@@ -21,9 +153,10 @@ def plot_strikes_over_time(df, title=None):
         template="plotly_white",
         hovermode="x unified"
     )
-    fig.show()
+    return _finish(_densify(fig), "plot_strikes_over_time")
 
 
+@_cached
 def plot_action_types_pie(df, title=None):
     fig = px.pie(
         df,
@@ -35,34 +168,55 @@ def plot_action_types_pie(df, title=None):
     fig.update_traces(textposition="inside", textinfo="percent+label")
     fig.update_layout(template="plotly_white")
 
-    fig.show()
-
-
-import plotly.graph_objects as go
-import pandas as pd
-
-def plot_indicator(df, y, title, yaxis_title, visible_industries):
-    fig = go.Figure()
-
-    df = df.copy()
-    df[y] = pd.to_numeric(df[y], errors="coerce")
+    return _finish(fig, "plot_action_types_pie")
+
+
+def _indicator_frame(df, columns):
+    """
+    Один проход для всех показателей: строки сортируются по (отрасль, год)
+    один раз, доли от суммы по году считаются сразу для всей таблицы.
+    Возвращает (отрасли, границы отраслей, годы, {показатель: (значения, доли)}).
+    """
+    codes, industries = pd.factorize(df["Industry_norm"], sort=True)
+    year_codes, year_uniques = pd.factorize(df["год"])
+    years = df["год"].to_numpy()
+
+    # как groupby: строки без отрасли в трейсы не попадают, но в суммы по году входят
+    rows = np.flatnonzero(codes >= 0)
+    order = rows[np.lexsort((years[rows], codes[rows]))]
+    bounds = np.searchsorted(codes[order], np.arange(len(industries) + 1))
+
+    known_year = year_codes >= 0
+    values = {}
+    for y in columns:
+        v = pd.to_numeric(df[y], errors="coerce").to_numpy(dtype=float)
+        totals = np.bincount(
+            year_codes[known_year],
+            weights=np.nan_to_num(v[known_year]),
+            minlength=len(year_uniques)
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(known_year, v / totals[year_codes] * 100, np.nan)
+        values[y] = (v[order], share[order])
 
-    year_totals = df.groupby("год")[y].sum()
+    return list(industries), bounds, years[order], values
 
-    for industry, group in df.groupby("Industry_norm"):
-        group = group.sort_values("год").copy()
 
-        group["share_pct"] = (
-            group[y] / group["год"].map(year_totals) * 100
-        )
+def _indicator_traces(frame, y, yaxis_title, visible_industries, visible=True):
+    industries, bounds, years, values = frame
+    v, share = values[y]
 
-        fig.add_trace(go.Scatter(
-            x=group["год"],
-            y=group[y].astype(float),   # 🔑 ВОТ ЭТО КЛЮЧ
+    traces = []
+    for i, industry in enumerate(industries):
+        lo, hi = bounds[i], bounds[i + 1]
+        shown = True if industry in visible_industries else "legendonly"
+        traces.append(go.Scatter(
+            x=years[lo:hi],
+            y=v[lo:hi],
             mode="lines+markers",
             name=industry,
-            visible=True if industry in visible_industries else "legendonly",
-            customdata=group["share_pct"].astype(float),
+            visible=shown if visible else False,
+            customdata=share[lo:hi],
             hovertemplate=(
                 "<b>%{fullData.name}</b><br>"
                 "Year: %{x}<br>"
@@ -71,6 +225,13 @@ def plot_indicator(df, y, title, yaxis_title, visible_industries):
                 "<extra></extra>"
             )
         ))
+    return traces
+
+
+@_cached
+def plot_indicator(df, y, title, yaxis_title, visible_industries):
+    frame = _indicator_frame(df, [y])
+    fig = go.Figure(_indicator_traces(frame, y, yaxis_title, visible_industries))
 
     fig.update_layout(
         title=title,
@@ -80,8 +241,58 @@ def plot_indicator(df, y, title, yaxis_title, visible_industries):
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(_densify(fig), "plot_indicator")
+
+
+@_cached
+def plot_indicators(df, indicators, visible_industries, title=None):
+    """
+    Несколько показателей на одной фигуре с выпадающим списком.
+    indicators — {колонка: подпись оси Y} (или список колонок)
+    """
+    if not isinstance(indicators, dict):
+        indicators = {y: y for y in indicators}
+    columns = list(indicators)
 
+    frame = _indicator_frame(df, columns)
+    n_industries = len(frame[0])
+
+    traces = []
+    for k, y in enumerate(columns):
+        traces.extend(_indicator_traces(
+            frame, y, indicators[y], visible_industries, visible=(k == 0)
+        ))
+
+    shown = [
+        True if industry in visible_industries else "legendonly"
+        for industry in frame[0]
+    ]
+    buttons = []
+    for k, y in enumerate(columns):
+        visible = [False] * len(traces)
+        visible[k * n_industries:(k + 1) * n_industries] = shown
+        buttons.append(dict(
+            label=indicators[y],
+            method="update",
+            args=[
+                {"visible": visible},
+                {"yaxis.title.text": indicators[y], "title.text": title or indicators[y]}
+            ]
+        ))
+
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title=title or indicators[columns[0]],
+        xaxis_title="Год",
+        yaxis_title=indicators[columns[0]],
+        template="plotly_white",
+        hovermode="x unified",
+        updatemenus=[dict(buttons=buttons, direction="down", x=0, xanchor="left", y=1.15)]
+    )
+
+    return _finish(_densify(fig), "plot_indicators")
+
+@_cached
 def plot_gdp(df): 
     fig = go.Figure()
 
@@ -123,8 +334,9 @@ def plot_gdp(df):
         hovermode='x unified'
     )
 
-    fig.show()
+    return _finish(fig, "plot_gdp")
 
+@_cached
 def plot_sunburst(sorted_industries, title):
     rows = []
 
@@ -169,8 +381,9 @@ def plot_sunburst(sorted_industries, title):
     )
 
     fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
-    fig.show()
+    return _finish(fig, "plot_sunburst")
 
+@_cached
 def plot_wages(df):
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -186,9 +399,10 @@ def plot_wages(df):
         template="plotly_white",
         hovermode="x unified"
     )
-    fig.show()
+    return _finish(fig, "plot_wages")
     
 
+@_cached
 def plot_strikes_by_city(df):
     fig = px.line(
         df,
@@ -203,9 +417,10 @@ def plot_strikes_by_city(df):
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(_densify(fig), "plot_strikes_by_city")
 
 
+@_cached
 def plot_strikes_by_industry(industry_year_df):
     fig_industry = px.line(
     industry_year_df,
@@ -220,8 +435,9 @@ def plot_strikes_by_industry(industry_year_df):
         hovermode="x unified"
     )
 
-    fig_industry.show()
+    return _finish(_densify(fig_industry), "plot_strikes_by_industry")
 
+@_cached
 def plot_strikes_by_subindustry(industry_year_df):
     fig_subindustry = px.line(
     industry_year_df,
@@ -235,8 +451,9 @@ def plot_strikes_by_subindustry(industry_year_df):
         yaxis_title="Число стачек",
         hovermode="x unified"
     )
-    fig_subindustry.show()
+    return _finish(fig_subindustry, "plot_strikes_by_subindustry")
 
+@_cached
 def plot_strikes_by_response_and_state(df):
         fig = px.bar(
             df,
@@ -252,8 +469,9 @@ def plot_strikes_by_response_and_state(df):
             hovermode="x unified"
         )
 
-        fig.show()
+        return _finish(fig, "plot_strikes_by_response_and_state")
 
+@_cached
 def plot_strikes_by_state_and_industry(df):
     fig = px.bar(
         df,
@@ -269,8 +487,9 @@ def plot_strikes_by_state_and_industry(df):
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(fig, "plot_strikes_by_state_and_industry")
 
+@_cached
 def plot_strikes_by_state_and_demand(df):
     fig = px.bar(
         df,
@@ -286,8 +505,9 @@ def plot_strikes_by_state_and_demand(df):
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(fig, "plot_strikes_by_state_and_demand")
 
+@_cached
 def plot_action_by_state_and_type(df):
     fig = px.bar(
         df,
@@ -303,8 +523,9 @@ def plot_action_by_state_and_type(df):
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(fig, "plot_action_by_state_and_type")
 
+@_cached
 def plot_strikes_by_size(
     all_df,
     gd_df,
@@ -352,8 +573,9 @@ def plot_strikes_by_size(
         hovermode="x unified"
     )
 
-    fig.show()
+    return _finish(fig, "plot_strikes_by_size")
 
+@_cached
 def plot_demands(total_by_demand):
     fig = px.bar(
         total_by_demand,
@@ -372,8 +594,9 @@ def plot_demands(total_by_demand):
         showlegend=False
     )
 
-    fig.show()
+    return _finish(fig, "plot_demands")
 
+@_cached
 def plot_industry_vulnerability(df, title):
     fig = px.scatter(
         df,
@@ -382,11 +605,18 @@ def plot_industry_vulnerability(df, title):
         color="strike_leverage",
         size="Weight",
         hover_name="Sector",
+        # интервалы из sensitivity.bootstrap_strike_leverage, если посчитаны
+        hover_data=[
+            col for col in ("strike_leverage_low", "strike_leverage_high")
+            if col in df.columns
+        ] or None,
         labels={
             "Employed Persons_pct_growth": "Рост занятости (%)",
             "Profit per Worker growth (%)": "Рост прибыли на 1 рабочего (%)",
             "Weight": "Доля отрасли в прибыли (%)",
-            "strike_leverage": "Структурная сила"
+            "strike_leverage": "Структурная сила",
+            "strike_leverage_low": "Структурная сила, нижняя граница",
+            "strike_leverage_high": "Структурная сила, верхняя граница"
         },
         title=title,
         size_max=80,
@@ -397,4 +627,7 @@ def plot_industry_vulnerability(df, title):
         coloraxis=dict(cmin=-1.5, cmax=1.5)
     )
 
-    fig.show()
\ No newline at end of file
+    return _finish(fig, "plot_industry_vulnerability")
+
+
+instrument_module(sys.modules[__name__])
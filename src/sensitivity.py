@@ -0,0 +1,323 @@
+"""
+Чувствительность strike_leverage к весам, alpha и базовым значениям:
+
+    from src import sensitivity as sens
+
+    table = an.strike_table_for_years(dl.load_industry_store(), 2013, 2023)
+    stats = sens.sensitivity_analysis(table, year_end=2023, n=10_000)
+
+Конфигурации (веса компонент, alpha в penalize, базы robust_zscore)
+разыгрываются вокруг значений build_strike_table и считаются все сразу:
+массивы конфигурации × отрасли. Результат — устойчивость рангов по отраслям.
+
+Доверительные интервалы самого индекса — бутстрэп по отраслям:
+
+    table = sens.bootstrap_strike_leverage(table, 2013, 2023, n_boot=10_000)
+    table[["Sector", "strike_leverage", "strike_leverage_low", "strike_leverage_high"]]
+"""
+
+import warnings
+
+from ._lazy import lazy_import
+from .analysis import _robust_zscore_rows
+
+futures = lazy_import("concurrent.futures")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# компонента индекса → колонка таблицы build_strike_table
+LEVERAGE_COMPONENTS = {
+    "comp_avg_workers": "avg_workers_per_enterprise",
+    "comp_emp_growth": "Employed Persons_pct_growth",
+    "comp_profit_worker": "profit_per_worker",
+    "comp_profit_per_worker_growth": "Profit per Worker growth (%)",
+}
+
+# значения build_strike_table
+LEVERAGE_WEIGHTS = (0.20, 0.20, 0.40, 0.20)
+LEVERAGE_ALPHA = 2
+BASE_AVG_WORKERS = 400
+
+
+def base_emp_growth(year_end):
+    return 64.61 if year_end == 2013 else 7.48
+
+
+def sample_configurations(
+    n,
+    year_end,
+    seed=0,
+    concentration=50,
+    alpha_range=(1.0, 4.0),
+    spread=0.5
+):
+    """
+    n конфигураций: веса — Dirichlet(concentration · LEVERAGE_WEIGHTS)
+    (сумма 1, в среднем как в build_strike_table), alpha — равномерно
+    в alpha_range, базы — равномерно в ±spread от значений build_strike_table
+    (для медианы прибыли на работника — множитель к ней).
+    Первая конфигурация — сама build_strike_table.
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.asarray(LEVERAGE_WEIGHTS) * concentration, size=n)
+    configs = {
+        "weights": weights,
+        "alpha": rng.uniform(*alpha_range, size=n),
+        "base_avg_workers": BASE_AVG_WORKERS * rng.uniform(1 - spread, 1 + spread, size=n),
+        "base_emp_growth": base_emp_growth(year_end) * rng.uniform(1 - spread, 1 + spread, size=n),
+        "profit_base_factor": rng.uniform(1 - spread, 1 + spread, size=n),
+    }
+    if n:
+        configs["weights"][0] = LEVERAGE_WEIGHTS
+        configs["alpha"][0] = LEVERAGE_ALPHA
+        configs["base_avg_workers"][0] = BASE_AVG_WORKERS
+        configs["base_emp_growth"][0] = base_emp_growth(year_end)
+        configs["profit_base_factor"][0] = 1.0
+    return configs
+
+
+def _shard(configs, start, stop):
+    return {name: values[start:stop] for name, values in configs.items()}
+
+
+def evaluate_configurations(components, configs, median_profit_base):
+    """
+    strike_leverage для всех конфигураций: массив конфигурации × отрасли.
+    components — {колонка: значения по отраслям} (LEVERAGE_COMPONENTS)
+    """
+    def column(name):
+        return np.asarray(components[LEVERAGE_COMPONENTS[name]], dtype=float)[None, :]
+
+    def base(values):
+        return np.asarray(values, dtype=float)[:, None]
+
+    z = [
+        _robust_zscore_rows(column("comp_avg_workers"), base(configs["base_avg_workers"])),
+        np.minimum(
+            _robust_zscore_rows(column("comp_emp_growth"), base(configs["base_emp_growth"])), 0
+        ),
+        _robust_zscore_rows(
+            column("comp_profit_worker"),
+            base(configs["profit_base_factor"]) * median_profit_base
+        ),
+        _robust_zscore_rows(column("comp_profit_per_worker_growth"), 0.0),
+    ]
+
+    alpha = base(configs["alpha"])
+    leverage = np.ones(np.broadcast_shapes(z[0].shape, alpha.shape))
+    for i, zi in enumerate(z):
+        x = base(configs["weights"][:, i]) * zi
+        leverage *= np.where(x >= 0, 1 + x, 1 / (1 + np.abs(x) * alpha))
+    return leverage - 1
+
+
+def _ranks(leverage):
+    # ранг 1 — наибольший strike_leverage
+    order = np.argsort(-leverage, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, leverage.shape[1] + 1)[None, :], axis=1)
+    return ranks
+
+
+def _evaluate_shard(components, configs, median_profit_base):
+    leverage = evaluate_configurations(components, configs, median_profit_base)
+    return leverage, _ranks(leverage)
+
+
+def sensitivity_analysis(
+    table,
+    year_end,
+    n=10_000,
+    seed=0,
+    top_k=5,
+    median_profit_base=None,
+    workers=None,
+    shard_size=20_000,
+    **sample_kwargs
+):
+    """
+    Устойчивость рангов strike_leverage по отраслям на n конфигурациях.
+    table — результат build_strike_table (или одна пара build_strike_tables);
+    отрасли с пропусками в компонентах отбрасываются.
+    workers > 1 — шарды по shard_size конфигураций на пуле процессов.
+
+    Колонки: baseline_rank / baseline_leverage (конфигурация build_strike_table),
+    mean_rank, std_rank, rank_p05 / rank_p50 / rank_p95, p_top_k (доля
+    конфигураций, где отрасль в первых top_k), p_rank_changed, mean_leverage,
+    leverage_p05 / leverage_p95. В attrs["spearman"] — корреляция Спирмена
+    рангов каждой конфигурации с базовыми: медиана и 5-й перцентиль.
+    """
+    if median_profit_base is None:
+        median_profit_base = float(table["profit_per_worker"].median())
+
+    columns = list(LEVERAGE_COMPONENTS.values())
+    table = table.loc[np.isfinite(table[columns].to_numpy(dtype=float)).all(axis=1)]
+    components = {col: table[col].to_numpy(dtype=float) for col in columns}
+
+    configs = sample_configurations(n, year_end, seed, **sample_kwargs)
+    shards = [_shard(configs, start, start + shard_size) for start in range(0, n, shard_size)]
+
+    if workers and workers > 1 and len(shards) > 1:
+        with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _evaluate_shard,
+                [components] * len(shards),
+                shards,
+                [median_profit_base] * len(shards)
+            ))
+    else:
+        results = [_evaluate_shard(components, shard, median_profit_base) for shard in shards]
+
+    leverage = np.concatenate([r[0] for r in results])
+    ranks = np.concatenate([r[1] for r in results])
+    baseline = ranks[0]
+
+    n_sectors = ranks.shape[1]
+    diff = ranks - baseline[None, :]
+    spearman = 1 - 6 * (diff ** 2).sum(axis=1) / (n_sectors * (n_sectors ** 2 - 1))
+
+    result = pd.DataFrame({
+        "Sector": table["Sector"].to_numpy(),
+        "baseline_rank": baseline,
+        "baseline_leverage": leverage[0],
+        "mean_rank": ranks.mean(axis=0),
+        "std_rank": ranks.std(axis=0),
+        "rank_p05": np.percentile(ranks, 5, axis=0),
+        "rank_p50": np.percentile(ranks, 50, axis=0),
+        "rank_p95": np.percentile(ranks, 95, axis=0),
+        "p_top_k": (ranks <= top_k).mean(axis=0),
+        "p_rank_changed": (diff != 0).mean(axis=0),
+        "mean_leverage": leverage.mean(axis=0),
+        "leverage_p05": np.percentile(leverage, 5, axis=0),
+        "leverage_p95": np.percentile(leverage, 95, axis=0),
+    }).sort_values("baseline_rank").reset_index(drop=True)
+
+    result.attrs["spearman"] = {
+        "median": float(np.median(spearman)),
+        "p05": float(np.percentile(spearman, 5)),
+    }
+    result.attrs["configurations"] = n
+    return result
+
+
+# --- бутстрэп: медианы и MAD robust_zscore по перевыборкам отраслей ---
+def _bootstrap_zscore(values, sample, base=None):
+    """
+    robust_zscore всех отраслей (values: B × n) с медианой и MAD,
+    посчитанными по перевыборке sample (B × n); base — фиксированная
+    медиана (скаляр или B × 1), None — медиана самой перевыборки
+    """
+    # как _robust_zscore_rows: отрасли без значения (NaN) не участвуют
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if base is None:
+            base = np.nanmedian(sample, axis=1, keepdims=True)
+        mad = np.nanmedian(np.abs(sample - base), axis=1, keepdims=True)
+    ok = (mad != 0) & ~np.isnan(mad)
+    return np.where(ok, (values - base) / (1.4826 * np.where(ok, mad, 1)), 0.0)
+
+
+def _figures(table, year_start, year_end, rng, n_boot, noise):
+    # показатели ежегодника (B × n); noise — логнормальный разброс каждой цифры
+    figures = {}
+    for col in ("Enterprises", "Total Profits", "Employed Persons"):
+        for year in (year_start, year_end):
+            values = table[f"{col}_{year}"].to_numpy(dtype=float)[None, :]
+            if noise:
+                values = values * rng.lognormal(0.0, noise, size=(n_boot, values.shape[1]))
+            figures[(col, year)] = values
+    return figures
+
+
+def bootstrap_strike_leverage(
+    table,
+    year_start,
+    year_end,
+    n_boot=10_000,
+    seed=0,
+    ci=0.95,
+    noise=None,
+    median_profit_base=None
+):
+    """
+    Перцентильные интервалы strike_leverage: отрасли перевыбираются с
+    возвращением (матрица B × n номеров), по каждой перевыборке — медианы
+    и MAD компонент, по ним — индекс всех отраслей таблицы.
+    noise (например 0.05) — дополнительно возмущает цифры ежегодника
+    (предприятия, прибыль, занятые) логнормальным шумом с этим σ.
+    table — результат build_strike_table за пару year_start → year_end.
+
+    Возвращает копию table с колонками strike_leverage_low / _high
+    (границы интервала ci) и strike_leverage_se (ст. отклонение по репликам).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(table)
+    rows = rng.integers(0, n, size=(n_boot, n))
+
+    if noise:
+        f = _figures(table, year_start, year_end, rng, n_boot, noise)
+        profit_per_worker = f[("Total Profits", year_end)] / f[("Employed Persons", year_end)]
+        profit_per_worker_start = f[("Total Profits", year_start)] / f[("Employed Persons", year_start)]
+        x = {
+            "avg_workers_per_enterprise": (
+                f[("Employed Persons", year_end)] * 10000 / f[("Enterprises", year_end)]
+            ),
+            "Employed Persons_pct_growth": (
+                f[("Employed Persons", year_end)] / f[("Employed Persons", year_start)] - 1
+            ) * 100,
+            "profit_per_worker": profit_per_worker,
+            "Profit per Worker growth (%)": (
+                np.arcsinh(profit_per_worker) - np.arcsinh(profit_per_worker_start)
+            ) * 100,
+        }
+    else:
+        x = {
+            col: table[col].to_numpy(dtype=float)[None, :]
+            for col in LEVERAGE_COMPONENTS.values()
+        }
+
+    def sample(col):
+        values = np.broadcast_to(x[col], (n_boot, n))
+        return np.take_along_axis(values, rows, axis=1)
+
+    def values(col):
+        return np.broadcast_to(x[col], (n_boot, n))
+
+    # те же компоненты, что в build_strike_table; базы — медианы перевыборок
+    z = [
+        _bootstrap_zscore(
+            values("avg_workers_per_enterprise"),
+            sample("avg_workers_per_enterprise"),
+            BASE_AVG_WORKERS
+        ),
+        np.minimum(_bootstrap_zscore(
+            values("Employed Persons_pct_growth"),
+            sample("Employed Persons_pct_growth"),
+            base_emp_growth(year_end)
+        ), 0),
+        _bootstrap_zscore(
+            values("profit_per_worker"),
+            sample("profit_per_worker"),
+            median_profit_base
+        ),
+        _bootstrap_zscore(
+            values("Profit per Worker growth (%)"),
+            sample("Profit per Worker growth (%)"),
+            0.0
+        ),
+    ]
+
+    leverage = np.ones((n_boot, n))
+    for weight, zi in zip(LEVERAGE_WEIGHTS, z):
+        x_i = weight * zi
+        leverage *= np.where(x_i >= 0, 1 + x_i, 1 / (1 + np.abs(x_i) * LEVERAGE_ALPHA))
+    leverage -= 1
+
+    tail = (1 - ci) / 2 * 100
+    low, high = np.nanpercentile(leverage, [tail, 100 - tail], axis=0)
+
+    table = table.copy()
+    table["strike_leverage_low"] = low
+    table["strike_leverage_high"] = high
+    table["strike_leverage_se"] = np.nanstd(leverage, axis=0)
+    return table
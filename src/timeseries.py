@@ -0,0 +1,262 @@
+import threading
+
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# разрешение → частота Period; номер корзины — ordinal этого Period
+RESOLUTIONS = {
+    "day": "D",
+    "week": "W-SUN",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+# категориальные колонки событий, по которым можно группировать и фильтровать
+TIME_BUCKET_COLUMNS = [
+    "State",
+    "City",
+    "Industry",
+    "subIndustry_name",
+    "Range_Number_of_Employees",
+    "Strike_or_Protest",
+]
+
+
+def _ordinals(days, resolution):
+    # номера дней от 1970-01-01 → ordinal Period нужной частоты
+    if resolution == "day":
+        return days
+    if resolution == "week":
+        # 1970-01-01 — четверг; недели W-SUN (пн–вс), неделя 29.12.1969 — ordinal 1
+        return (days + 3) // 7 + 1
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if resolution == "month":
+        return months
+    if resolution == "quarter":
+        return months // 3
+    if resolution == "year":
+        return months // 12
+    raise ValueError(f"unknown resolution {resolution!r}, expected one of {list(RESOLUTIONS)}")
+
+
+def _where_key(value):
+    # множество — без порядка, поэтому в ключе кэша сортируется
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
+
+class TimeBuckets:
+    """
+    Счётчики событий по времени на любом разрешении (день, неделя, месяц,
+    квартал, год). Даты переводятся в целые номера дней один раз; номер
+    корзины — целочисленная арифметика над ними, счётчики — np.bincount
+    по (корзина, группа). Результаты кэшируются по (разрешение, by, where),
+    так что переключение графика с годов на месяцы и обратно не считает
+    заново.
+    """
+
+    def __init__(self, dates, columns=None):
+        dates = pd.to_datetime(pd.Series(dates), errors="coerce")
+        self.valid = dates.notna().to_numpy()
+        self.days = (
+            dates.to_numpy(dtype="datetime64[ns]")
+            .astype("datetime64[D]")
+            .astype(np.int64)
+        )
+        self.columns = dict(columns or {})
+        self._lock = threading.RLock()
+        self._buckets = {}
+        self._keys = {}
+        self._counts = {}
+        self._pending = []
+
+    @property
+    def n_events(self):
+        with self._lock:
+            self._merge_pending()
+            return int(self.valid.sum())
+
+    def append(self, dates, columns=None):
+        """
+        Дописывает события. Уже посчитанные счётчики обновляются счётчиками
+        одной пачки; сами массивы пачек склеиваются с основными только
+        при следующем новом запросе
+        """
+        dates = pd.Series(dates).reset_index(drop=True)
+        columns = columns or {}
+        batch = TimeBuckets(dates, {
+            column: (
+                pd.Series(columns[column]).reset_index(drop=True)
+                if column in columns else pd.Series([None] * len(dates), dtype=object)
+            )
+            for column in self.columns
+        })
+
+        with self._lock:
+            self._pending.append(batch)
+            self._buckets.clear()
+            self._keys.clear()
+            for key, result in self._counts.items():
+                resolution, by, where = key
+                self._counts[key] = _add_counts(
+                    result, batch._count(resolution, list(by), dict(where))
+                )
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+        batches, self._pending = self._pending, []
+        self.valid = np.concatenate([self.valid] + [b.valid for b in batches])
+        self.days = np.concatenate([self.days] + [b.days for b in batches])
+        self.columns = {
+            column: pd.concat(
+                [values] + [b.columns[column] for b in batches],
+                ignore_index=True
+            )
+            for column, values in self.columns.items()
+        }
+
+    def buckets(self, resolution):
+        """ordinal Period для каждого события (NaT — мусор, см. valid)"""
+        with self._lock:
+            self._merge_pending()
+            if resolution not in self._buckets:
+                self._buckets[resolution] = _ordinals(self.days, resolution)
+            return self._buckets[resolution]
+
+    def key(self, column):
+        """Коды и подписи колонки (factorize, по возрастанию; NaN — -1)"""
+        with self._lock:
+            self._merge_pending()
+            if column not in self._keys:
+                if column not in self.columns:
+                    raise KeyError(f"column {column!r} is not in the time buckets")
+                codes, labels = pd.factorize(self.columns[column], sort=True)
+                self._keys[column] = (np.asarray(codes), labels)
+            return self._keys[column]
+
+    def _where_mask(self, where):
+        mask = self.valid.copy()
+        for column, value in (where or {}).items():
+            codes, labels = self.key(column)
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            wanted = [i for i, label in enumerate(labels) if label in values]
+            mask &= np.isin(codes, wanted)
+        return mask
+
+    def _count(self, resolution, by, where):
+        buckets = self.buckets(resolution)
+        mask = self._where_mask(where)
+        freq = RESOLUTIONS[resolution]
+
+        keys = [self.key(column) for column in by]
+        for codes, _ in keys:
+            mask &= codes >= 0
+
+        buckets = buckets[mask]
+        if len(buckets) == 0:
+            index = pd.PeriodIndex([], freq=freq, name=resolution)
+            return pd.DataFrame(index=index, columns=["count"] if not by else [], dtype=np.int64)
+
+        # только встречающиеся сочетания групп (как StrikeCube._group): ключ
+        # уплотняется после каждой колонки и не зависит от произведения
+        # размеров; номера групп — в лексикографическом порядке подписей
+        columns = [codes[mask] for codes, _ in keys]
+        group = np.zeros(len(buckets), dtype=np.int64)
+        first = np.zeros(1, dtype=np.int64)
+        for codes, (_, column_labels) in zip(columns, keys):
+            _, first, group = np.unique(
+                group * len(column_labels) + codes,
+                return_index=True,
+                return_inverse=True
+            )
+            group = group.reshape(-1)
+        n_groups = len(first)
+
+        start = int(buckets.min())
+        n_buckets = int(buckets.max()) - start + 1
+        counts = np.bincount(
+            (buckets - start) * n_groups + group,
+            minlength=n_buckets * n_groups
+        ).reshape(n_buckets, n_groups)
+
+        index = pd.PeriodIndex.from_ordinals(
+            np.arange(start, start + n_buckets), freq=freq
+        ).rename(resolution)
+        if not by:
+            return pd.DataFrame({"count": counts[:, 0]}, index=index)
+
+        group_labels = [
+            column_labels[codes[first]]
+            for codes, (_, column_labels) in zip(columns, keys)
+        ]
+        if len(by) == 1:
+            columns = pd.Index(group_labels[0], name=by[0])
+        else:
+            columns = pd.MultiIndex.from_arrays(group_labels, names=by)
+        return pd.DataFrame(counts, index=index, columns=columns)
+
+    def counts(self, resolution="year", by=None, where=None, rolling=None):
+        """
+        Счётчики: строки — корзины подряд от первой до последней (пустые — 0),
+        колонки — count или группы by (одна колонка или список).
+        where — фильтр {колонка: значение или список значений};
+        rolling — скользящая сумма по стольким корзинам (включая текущую).
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        key = (
+            resolution,
+            tuple(by),
+            tuple(sorted(
+                (column, _where_key(value))
+                for column, value in (where or {}).items()
+            )),
+        )
+        with self._lock:
+            if key not in self._counts:
+                self._counts[key] = self._count(resolution, by, where)
+            result = self._counts[key]
+
+        if rolling:
+            values = np.cumsum(result.to_numpy(), axis=0)
+            values[rolling:] = values[rolling:] - values[:-rolling]
+            return pd.DataFrame(values, index=result.index, columns=result.columns)
+        return result.copy()
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+def _add_counts(total, batch):
+    # сумма двух таблиц counts: корзины — снова подряд без пропусков,
+    # колонки — объединение групп в порядке подписей, как у _count
+    if len(batch.index) == 0:
+        return total
+    if len(total.index) == 0:
+        return batch
+
+    first = min(total.index.min(), batch.index.min())
+    last = max(total.index.max(), batch.index.max())
+    index = pd.PeriodIndex.from_ordinals(
+        np.arange(first.ordinal, last.ordinal + 1), freq=total.index.freq
+    ).rename(total.index.name)
+    columns = total.columns.union(batch.columns)
+    return (
+        total.reindex(index=index, columns=columns, fill_value=0)
+        + batch.reindex(index=index, columns=columns, fill_value=0)
+    ).astype(np.int64)
+
+
+def build_time_buckets(df, date_col="Start_Date", columns=TIME_BUCKET_COLUMNS):
+    """TimeBuckets по таблице событий (load_strikes_df)"""
+    return TimeBuckets(
+        df[date_col],
+        {column: df[column] for column in columns if column in df.columns}
+    )
@@ -0,0 +1,75 @@
+import threading
+from pathlib import Path
+
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# статистические ежегодники Гуандуна в колоночном виде (numpy .npz, без pickle):
+# "<таблица>:columns" — порядок колонок, "<таблица>:<i>" — числовая колонка,
+# "<таблица>:<i>:codes" + "<таблица>:<i>:labels" — строковая (словарь + коды)
+YEARBOOK_PATH = Path(__file__).with_name("data") / "yearbook.npz"
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def write_yearbook(tables, path=YEARBOOK_PATH):
+    """
+    Сохраняет {имя таблицы: DataFrame} в .npz (для пополнения данных новыми годами)
+    """
+    arrays = {}
+    for name, df in tables.items():
+        arrays[f"{name}:columns"] = np.asarray(list(df.columns), dtype=str)
+        for i, col in enumerate(df.columns):
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values):
+                arrays[f"{name}:{i}"] = values.to_numpy()
+            else:
+                codes, labels = pd.factorize(values)
+                arrays[f"{name}:{i}:codes"] = codes.astype(np.int32)
+                arrays[f"{name}:{i}:labels"] = np.asarray(labels, dtype=str)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez_compressed(tmp, **arrays)
+    tmp.replace(path)
+    return path
+
+
+def _decode(store, name):
+    columns = store[f"{name}:columns"].tolist()
+    data = {}
+    for i, col in enumerate(columns):
+        if f"{name}:{i}" in store:
+            data[col] = store[f"{name}:{i}"]
+        else:
+            codes = store[f"{name}:{i}:codes"]
+            labels = store[f"{name}:{i}:labels"].astype(object)
+            values = labels[np.maximum(codes, 0)]
+            values[codes < 0] = None
+            data[col] = values
+    return pd.DataFrame(data, columns=columns)
+
+
+def yearbook_table(name, path=YEARBOOK_PATH):
+    """
+    Таблица из ежегодника; файл читается один раз, дальше — из памяти.
+    Возвращается общий объект: вызывающий не должен его менять.
+    """
+    key = (str(path), name)
+    table = _tables.get(key)
+    if table is None:
+        with _tables_lock:
+            if key not in _tables:
+                with np.load(path, allow_pickle=False) as store:
+                    _tables[key] = _decode(store, name)
+            table = _tables[key]
+    return table
+
+
+def clear_yearbook_cache():
+    with _tables_lock:
+        _tables.clear()
@@ -0,0 +1,37 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import data_loading as dl  # noqa: E402
+from src.benchmark import synthetic_strikes  # noqa: E402
+
+
+def write_strikes(path, df):
+    """Пишет таблицу событий в формате chinese_strikes.json"""
+    records = json.loads(df.to_json(orient="records", force_ascii=False))
+    Path(path).write_text(
+        json.dumps({"chinese_strikes": records}, ensure_ascii=False),
+        encoding="utf-8"
+    )
+    return Path(path)
+
+
+@pytest.fixture
+def strikes():
+    return synthetic_strikes(3000, seed=1)
+
+
+@pytest.fixture
+def strikes_path(tmp_path, strikes):
+    return write_strikes(tmp_path / "chinese_strikes.json", strikes)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    dl.clear_strikes_cache()
+    yield
+    dl.clear_strikes_cache()
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from src import analysis as an
+from src import data_loading as dl
+from src.data_loading import STRIKES_TABLE_ATTR
+
+
+def _reference(df, field, by):
+    # прямой подсчёт: разбиение строки и groupby
+    rows = df[by + [field]].dropna(subset=[field])
+    rows = rows.assign(**{field: rows[field].str.split("/")}).explode(field)
+    rows = rows[rows[field] != ""]
+    return rows.groupby(by + [field]).size().rename("count").reset_index()
+
+
+def _sorted(df, keys):
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def test_explode_count_uses_cached_matrix(strikes_path):
+    df = dl.load_strikes_df(strikes_path)
+    assert df.attrs.get(STRIKES_TABLE_ATTR)
+
+    cached = an.explode_count(df, "Worker_Demands", by="State")
+    assert ("Worker_Demands", "/", None, True) in dl._strikes_entry(strikes_path)["incidence"]
+
+    # без метки таблицы поле разбирается заново — ответ тот же
+    plain = df.copy()
+    plain.attrs.clear()
+    parsed = an.explode_count(plain, "Worker_Demands", by="State")
+
+    keys = ["State", "Worker_Demands"]
+    pd.testing.assert_frame_equal(_sorted(cached, keys), _sorted(parsed, keys))
+    pd.testing.assert_frame_equal(
+        _sorted(cached, keys),
+        _sorted(_reference(plain, "Worker_Demands", ["State"]), keys),
+        check_dtype=False
+    )
+
+
+def test_count_tokens_matches_explode_count(strikes_path):
+    query = dl.StrikeQuery(strikes_path).years(2015, 2020).state("Guangdong")
+    counted = query.group_by("Industry").count_tokens("Action_Response").collect()
+    expected = an.explode_count(query.collect(), "Action_Response", by=["Industry"])
+
+    keys = ["Industry", "Action_Response"]
+    pd.testing.assert_frame_equal(_sorted(counted, keys), _sorted(expected, keys))
+
+
+def test_row_subset_slices_matrix(strikes_path):
+    df = dl.load_strikes_df(strikes_path)
+    subset = df[df["State"] == "Guangdong"].iloc[::3]
+
+    counted = an.explode_count(subset, "Strike_or_Protest")
+    plain = subset.copy()
+    plain.attrs.clear()
+    expected = an.explode_count(plain, "Strike_or_Protest")
+
+    keys = ["Strike_or_Protest"]
+    pd.testing.assert_frame_equal(_sorted(counted, keys), _sorted(expected, keys))
@@ -0,0 +1,104 @@
+import pandas as pd
+
+from src import analysis
+from src import data_loading as dl
+
+from conftest import write_strikes
+
+
+QUERIES = [
+    lambda q: q.years(2011, 2024).actions("Strike"),
+    lambda q: q.years(2015, 2018).state("Guangdong"),
+    lambda q: q.dates("2016-03-15", "2019-07-01").actions("Protest"),
+    lambda q: q.industry("Taxi"),
+]
+
+TIMELINES = [
+    ("year", None, None),
+    ("month", "State", None),
+    ("quarter", ["State", "Industry"], None),
+    ("week", None, {"Industry": ["Manufacturing", "Transportation"]}),
+]
+
+
+def _split(strikes, n_base):
+    # дописываются только события с датой: пустую append_strikes отвергает
+    tail = strikes.iloc[n_base:]
+    tail = tail[tail["Start_Date"] != ""]
+    return strikes.iloc[:n_base], tail
+
+
+def _warm(path):
+    # всё, что append_strikes должен дописать, а не выбросить
+    for query in QUERIES:
+        query(dl.StrikeQuery(path)).collect()
+    buckets = dl.load_time_buckets(path)
+    for resolution, by, where in TIMELINES:
+        buckets.counts(resolution, by, where)
+    dl.load_strike_cube(path)
+    analysis.explode_count(dl.load_strikes_df(path), "Worker_Demands", by="State")
+
+
+def _results(path):
+    df = dl.load_strikes_df(path)
+    buckets = dl.load_time_buckets(path)
+    return {
+        "df": df,
+        "queries": [query(dl.StrikeQuery(path)).collect() for query in QUERIES],
+        "timelines": [buckets.counts(*args) for args in TIMELINES],
+        "tokens": analysis.explode_count(df, "Worker_Demands", by="State"),
+        "demand": analysis.prepare_strikes_by_state_and_demand(df),
+        "cube": analysis.prepare_strikes_by_year_and_city(dl.load_strike_cube(path)),
+        "count": dl.StrikeQuery(path).years(2011, 2024).count_tokens("Action_Response").collect(),
+    }
+
+
+def _assert_same(appended, reloaded):
+    for name in ("df", "tokens", "demand", "cube", "count"):
+        pd.testing.assert_frame_equal(appended[name], reloaded[name], obj=name)
+    for a, b in zip(appended["queries"], reloaded["queries"]):
+        pd.testing.assert_frame_equal(a, b)
+    for a, b in zip(appended["timelines"], reloaded["timelines"]):
+        pd.testing.assert_frame_equal(a, b, check_index_type=False, check_column_type=False)
+
+
+def test_append_matches_full_reload(tmp_path, strikes):
+    base, tail = _split(strikes, 2000)
+    base_path = write_strikes(tmp_path / "base.json", base)
+    full_path = write_strikes(tmp_path / "full.json", pd.concat([base, tail]))
+
+    _warm(base_path)
+    for batch in (tail.iloc[:1], tail.iloc[1:300], tail.iloc[300:]):
+        dl.append_strikes(base_path, batch.to_dict("records"))
+
+    appended = _results(base_path)
+    dl.clear_strikes_cache()
+    _assert_same(appended, _results(full_path))
+
+
+def test_append_between_reads(tmp_path, strikes):
+    # чтение после каждой пачки: индексы и матрицы дописываются по кускам
+    base, tail = _split(strikes, 2500)
+    base_path = write_strikes(tmp_path / "base.json", base)
+    full_path = write_strikes(tmp_path / "full.json", pd.concat([base, tail]))
+
+    _warm(base_path)
+    for start in range(0, len(tail), 25):
+        dl.append_strikes(base_path, tail.iloc[start:start + 25])
+        _results(base_path)
+
+    appended = _results(base_path)
+    dl.clear_strikes_cache()
+    _assert_same(appended, _results(full_path))
+    assert len(dl.load_strikes_table(full_path)) == len(base) + len(tail)
+
+
+def test_append_rejects_duplicate_ids(strikes_path, strikes):
+    dl.load_strikes_table(strikes_path)
+    record = strikes.iloc[[0]].to_dict("records")
+    try:
+        dl.append_strikes(strikes_path, record)
+    except ValueError as e:
+        assert "duplicate id" in str(e)
+    else:
+        raise AssertionError("duplicate id accepted")
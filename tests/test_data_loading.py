@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+
+from src import data_loading as dl
+
+from conftest import write_strikes
+
+
+def test_loaders_return_independent_frames(strikes_path):
+    table = dl.load_strikes_table(strikes_path)
+    events = dl.load_strikes_df(strikes_path)
+    state = table.loc[0, "State"]
+
+    table.loc[0, "State"] = "changed"
+    events.iloc[0, events.columns.get_loc("State")] = "changed"
+
+    assert dl.load_strikes_table(strikes_path).loc[0, "State"] == state
+    assert "changed" not in set(dl.load_strikes_df(strikes_path)["State"])
+
+
+def test_install_strikes_table_keeps_own_copy(strikes_path):
+    df = dl.load_strikes_table(strikes_path).copy()
+    dl.clear_strikes_cache()
+    dl.install_strikes_table(strikes_path, df)
+
+    state = df.loc[0, "State"]
+    df.loc[0, "State"] = "changed"
+    df.drop(index=df.index[1:], inplace=True)
+
+    table = dl.load_strikes_table(strikes_path)
+    assert len(table) > 1
+    assert table.loc[0, "State"] == state
+
+
+def test_string_columns_by_default(strikes_path):
+    for df in (dl.load_strikes_table(strikes_path), dl.load_strikes_df(strikes_path)):
+        assert not isinstance(df["State"].dtype, pd.CategoricalDtype)
+    compact = dl.load_strikes_df(strikes_path, compact=True)
+    assert isinstance(compact["State"].dtype, pd.CategoricalDtype)
+
+
+def test_cache_follows_file_changes(strikes_path, strikes):
+    first = dl.load_strikes_df(strikes_path)
+    dl.StrikeQuery(strikes_path).state("Guangdong").collect()
+
+    # другой размер и mtime — запись кэша устаревает вместе с индексами
+    write_strikes(strikes_path, strikes.iloc[:1000])
+    stat = os.stat(strikes_path)
+    os.utime(strikes_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    second = dl.load_strikes_df(strikes_path)
+    assert len(second) < len(first)
+    assert second["id"].max() <= 1000
+    guangdong = dl.StrikeQuery(strikes_path).state("Guangdong").collect()
+    assert guangdong["id"].max() <= 1000
+
+
+def test_cache_serves_repeated_loads(strikes_path):
+    dl.load_strikes_table(strikes_path)
+    hits = dl.strikes_cache_info()["hits"]
+    dl.load_strikes_df(strikes_path)
+    dl.load_strikes_table(strikes_path)
+    assert dl.strikes_cache_info()["hits"] > hits
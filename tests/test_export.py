@@ -0,0 +1,65 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.export import FigureExporter
+
+
+def _fake_serve(conn):
+    # рабочий процесс без Kaleido: "hang" пишет часть файла и зависает
+    conn.send(None)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        fig_json, targets = task[0], task[1]
+        for _, target in targets:
+            Path(target).write_text(fig_json, encoding="utf-8")
+        if fig_json == "hang":
+            time.sleep(60)
+        if fig_json == "fail":
+            conn.send((False, ValueError("bad figure")))
+        else:
+            conn.send((True, [target for _, target in targets]))
+
+
+class _FakeExporter(FigureExporter):
+    _worker_target = staticmethod(_fake_serve)
+
+
+def test_timeout_replaces_worker(tmp_path):
+    exporter = _FakeExporter(tmp_path, formats=("json",), workers=1, timeout=2)
+    try:
+        hung = exporter.submit("hang", "hung")
+        with pytest.raises(TimeoutError):
+            hung.result()
+        # недописанный файл удалён, следующая фигура — на новом процессе
+        assert not (tmp_path / "hung.json").exists()
+        assert exporter.submit("{}", "next").result() == [str(tmp_path / "next.json")]
+        written, failed = exporter.join()
+    finally:
+        exporter.close()
+
+    assert list(written) == ["next"]
+    assert isinstance(failed["hung"], TimeoutError)
+
+
+def test_failed_figure_is_reported(tmp_path):
+    exporter = _FakeExporter(tmp_path, formats=("json",), workers=2, timeout=10)
+    try:
+        exporter.submit("fail", "broken")
+        exporter.submit("{}", "fine")
+        exporter.submit("{}", "fine")
+        written, failed = exporter.join()
+    finally:
+        exporter.close()
+
+    assert set(written) == {"fine", "fine_2"}
+    assert isinstance(failed["broken"], ValueError)
+    assert not (tmp_path / "broken.json").exists()
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        FigureExporter("unused", formats=("gif",), workers=1)
@@ -0,0 +1,68 @@
+import os
+import shutil
+
+from src.figure_cache import FigureCache
+
+
+class _CountingCache(FigureCache):
+    walks = 0
+
+    def _entries(self):
+        self.walks += 1
+        return super()._entries()
+
+
+def _key(i):
+    return f"{i:064x}"
+
+
+def test_store_walks_cache_only_when_estimate_exceeds_limit(tmp_path):
+    cache = _CountingCache(tmp_path, max_bytes=10_000)
+    for i in range(20):
+        cache.put_figure(_key(i), "x" * 100)
+    assert cache.walks == 1
+
+    for i in range(20, 200):
+        cache.put_figure(_key(i), "x" * 100)
+    assert cache.walks > 1
+    assert cache.size() <= cache.max_bytes
+
+
+def test_eviction_drops_least_recently_read(tmp_path):
+    cache = FigureCache(tmp_path, max_bytes=1_000)
+    cache.put_figure(_key(1), "a" * 400)
+    cache.put_figure(_key(2), "b" * 400)
+    old = os.stat(cache._entry(_key(1))).st_mtime - 60
+    os.utime(cache._entry(_key(1)), (old, old))
+    os.utime(cache._entry(_key(2)), (old - 60, old - 60))
+    assert cache.get_figure(_key(1)) == "a" * 400
+
+    cache.put_figure(_key(3), "c" * 400)
+
+    assert cache.get_figure(_key(2)) is None
+    assert cache.get_figure(_key(1)) is not None
+    assert cache.get_figure(_key(3)) is not None
+
+
+def test_replacing_entry_keeps_size_estimate(tmp_path):
+    cache = FigureCache(tmp_path, max_bytes=10_000)
+    for _ in range(5):
+        cache.put_figure(_key(1), "x" * 1000)
+    assert cache._size == cache.size() == 1000
+
+
+class _RacingCache(FigureCache):
+    # другой процесс вытесняет запись между проверкой и чтением
+    def _read(self, key, filename):
+        target = super()._read(key, filename)
+        if target is not None:
+            shutil.rmtree(target.parent)
+        return target
+
+
+def test_figure_removed_during_read_is_a_miss(tmp_path):
+    cache = _RacingCache(tmp_path)
+    cache.put_figure(_key(1), "{}")
+
+    assert cache.get_figure(_key(1)) is None
+    assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from src import analysis as an
+from src import data_loading as dl
+from src.industry_store import build_industry_store
+
+
+def test_economic_years_keep_their_label():
+    industry = pd.DataFrame({
+        "year": [2003],
+        "Sector": ["Mining"],
+        "Enterprises": [1.0],
+        "Business Revenue": [2.0],
+        "Output Value": [3.0],
+        "Total Profits": [4.0],
+        "Employed Persons": [5.0],
+    })
+    economic = pd.DataFrame({
+        "год": [2002, 2003, 2004],
+        "Отрасль": ["Mining"] * 3,
+        "Number": [10.0, 20.0, 30.0],
+        "TotalOutput": [1.0, 1.0, 1.0],
+        "Профит": [1.0, 1.0, 1.0],
+        "Workers": [1.0, 1.0, 1.0],
+    })
+
+    store = build_industry_store(industry, economic)
+
+    assert store.years == [2002, 2003, 2004]
+    assert store.value(2002, "Mining", "Enterprises") == 10.0
+    # год из отраслевых таблиц берётся оттуда
+    assert store.value(2003, "Mining", "Enterprises") == 1.0
+
+
+def test_store_strike_table_matches_yearbook_tables():
+    table = an.strike_table_for_years(dl.load_industry_store(), 2013, 2023)
+    expected = an.build_strike_table(
+        dl.load_industry_data(2013), dl.load_industry_data(2023), 2013, 2023
+    )
+    pd.testing.assert_frame_equal(table, expected, check_dtype=False)
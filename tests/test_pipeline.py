@@ -0,0 +1,44 @@
+import json
+
+from src import instrumentation as ins
+from src import pipeline
+from src import plots
+
+
+def _broken(path, inputs):
+    raise RuntimeError("broken analysis")
+
+
+def test_init_worker_drops_inherited_spans(tmp_path, strikes_path):
+    # так выглядит рабочий процесс сразу после fork из трассируемого родителя
+    with ins.tracing():
+        with ins.trace("parent"):
+            pass
+        assert ins.spans()
+        try:
+            pipeline._init_worker(str(strikes_path), str(tmp_path), {}, False, None, True)
+            assert "parent" not in [record["name"] for record in ins.spans()]
+        finally:
+            plots.set_output()
+            ins.reset()
+
+
+def test_manifest_records_errors_and_reuses_results(tmp_path, strikes_path, monkeypatch):
+    # рабочие процессы пула — fork, подмена анализа до них доходит
+    monkeypatch.setitem(pipeline.ANALYSES, "06_gdp_composition", ((), _broken))
+    out = tmp_path / "out"
+    names = ["01_strikes", "06_gdp_composition"]
+
+    manifest = pipeline.run_pipeline(strikes_path, out, names, workers=2, formats=["json"])
+
+    assert manifest["01_strikes"]["files"]
+    assert "errors" not in manifest["01_strikes"]
+    assert any(f.endswith(".json") for f in manifest["01_strikes"]["files"])
+    assert "broken analysis" in manifest["06_gdp_composition"]["errors"][0]
+    assert set(json.loads((out / "manifest.json").read_text(encoding="utf-8"))) == set(names)
+
+    # посчитанный анализ не пересчитывается, упавший — пересчитывается
+    manifest = pipeline.run_pipeline(strikes_path, out, names, workers=2, formats=["json"])
+    assert manifest["01_strikes"].get("cached")
+    assert not manifest["06_gdp_composition"].get("cached")
+    assert manifest["06_gdp_composition"]["errors"]
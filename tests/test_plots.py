@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from src import plots
+
+
+@pytest.fixture(autouse=True)
+def return_figures():
+    plots.set_output("return")
+    yield
+    plots.set_output()
+
+
+def _indicators(n_rows):
+    return pd.DataFrame({
+        "Industry_norm": ["Mining", "Manufacturing", "Mining", None][:n_rows],
+        "год": [2020, 2020, 2021, 2021][:n_rows],
+        "Employed Persons": [10.0, 30.0, 20.0, 5.0][:n_rows],
+    })
+
+
+def test_indicator_on_empty_frame():
+    fig = plots.plot_indicator(_indicators(0), "Employed Persons", "t", "y", ["Mining"])
+    assert len(fig.data) == 0
+
+    fig = plots.plot_indicators(_indicators(0), ["Employed Persons"], ["Mining"])
+    assert len(fig.data) == 0
+
+
+def test_indicator_shares():
+    # строка без отрасли в трейсы не попадает, но входит в сумму по году
+    fig = plots.plot_indicator(_indicators(4), "Employed Persons", "t", "y", ["Mining"])
+    mining = next(trace for trace in fig.data if trace.name == "Mining")
+    assert list(mining.x) == [2020, 2021]
+    assert [round(v, 6) for v in mining.customdata] == [25.0, 80.0]
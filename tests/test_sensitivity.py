@@ -0,0 +1,25 @@
+import numpy as np
+
+from src import sensitivity as sens
+from src.analysis import _robust_zscore_rows
+
+
+def test_bootstrap_zscore_skips_missing_industries():
+    values = np.array([[1.0, 2.0, np.nan, 4.0, 10.0]])
+
+    z = sens._bootstrap_zscore(values, values)
+
+    base = np.nanmedian(values)
+    expected = _robust_zscore_rows(values, base)
+    np.testing.assert_allclose(z, expected)
+    assert z[0, 4] > 0
+
+
+def test_bootstrap_zscore_fixed_base():
+    values = np.array([[1.0, np.nan, 3.0], [np.nan, np.nan, np.nan]])
+
+    z = sens._bootstrap_zscore(values, values, 0.0)
+
+    np.testing.assert_allclose(z[0], _robust_zscore_rows(values[:1], 0.0)[0])
+    # перевыборка без единого значения — нулевой z, как у _robust_zscore_rows
+    assert (z[1] == 0).all()
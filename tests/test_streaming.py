@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from src import data_loading as dl
+
+from conftest import write_strikes
+
+
+FILTERS = [
+    dict(start_date="2015-01-01", end_date="2018-06-15 12:00:00", strike_pattern="Strike"),
+    dict(state="Guangdong", industry="Taxi"),
+    dict(state="Nowhere"),
+    dict(start_date="2099-01-01"),
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("columns", [None, ["Start_Date", "State", "id"]])
+def test_stream_matches_indexed(strikes_path, filters, columns):
+    expected = dl._indexed_strikes(strikes_path, columns=columns, **filters)
+    streamed = dl.stream_strikes_df(strikes_path, columns=columns, **filters)
+    # номера строк файла, полная схема и типы — и для пустого результата
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_stream_load_strikes_df(strikes_path):
+    pd.testing.assert_frame_equal(
+        dl.load_strikes_df(strikes_path, 2012, 2020, stream=True),
+        dl.load_strikes_df(strikes_path, 2012, 2020)
+    )
+
+
+def test_stream_compares_time_of_day(tmp_path, strikes):
+    events = strikes.iloc[:4].assign(Start_Date=[
+        "2020-05-01 08:00:00",
+        "2020-05-01T18:30:00",
+        "2020-05-01",
+        "2020-05-02",
+    ])
+    path = write_strikes(tmp_path / "times.json", events)
+
+    df = dl.stream_strikes_df(path, start_date="2020-05-01 06:00", end_date="2020-05-01 12:00:00")
+    assert df.index.tolist() == [0]
+
+    df = dl.stream_strikes_df(path, start_date="2020-05-01 12:00:00")
+    assert df.index.tolist() == [1, 3]
+
+    df = dl.stream_strikes_df(path, end_date="2020-05-01 00:00:01")
+    assert df.index.tolist() == [2]
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from src import data_loading as dl
+from src.timeseries import build_time_buckets
+
+
+def test_counts_match_groupby(strikes_path):
+    df = dl.load_strikes_df(strikes_path)
+    buckets = build_time_buckets(df)
+
+    counts = buckets.counts("quarter", by=["State", "Industry"])
+
+    events = df.dropna(subset=["Start_Date", "State", "Industry"])
+    expected = (
+        events.groupby([events["Start_Date"].dt.to_period("Q"), "State", "Industry"])
+        .size()
+        .unstack(["State", "Industry"], fill_value=0)
+    )
+    # только встречающиеся сочетания групп, корзины — подряд без пропусков
+    assert set(counts.columns) == set(expected.columns)
+    assert len(counts) == counts.index.max().ordinal - counts.index.min().ordinal + 1
+    assert (counts.loc[expected.index, expected.columns].to_numpy() == expected.to_numpy()).all()
+    assert counts.drop(index=expected.index).to_numpy().sum() == 0
+
+
+def test_set_filters_share_cache_entry(strikes_path):
+    buckets = dl.load_time_buckets(strikes_path)
+    first = buckets.counts("month", where={"State": {"Guangdong", "Beijing"}})
+    second = buckets.counts("month", where={"State": {"Beijing", "Guangdong"}})
+
+    pd.testing.assert_frame_equal(first, second)
+    keys = [key for key in buckets._counts if key[0] == "month"]
+    assert len(keys) == 1
+
+
+def test_rolling_sum(strikes_path):
+    buckets = dl.load_time_buckets(strikes_path)
+    counts = buckets.counts("month")
+    rolling = buckets.counts("month", rolling=3)
+    expected = counts.rolling(3, min_periods=1).sum().astype("int64")
+    pd.testing.assert_frame_equal(rolling, expected, check_dtype=False)